@@ -7,10 +7,11 @@ import streamlit as st
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from db import init_db, query_tweets
+from db import init_db, query_page, window_stats
+from timeutil import to_ms
 
 try:
-    from collector import collect_feedback
+    from collector import collect_feedback, interrupted_run
     _CAN_FETCH = True
 except Exception:
     _CAN_FETCH = False
@@ -47,6 +48,28 @@ _RANGE_HOURS = {
     "Last 30 days": 720,
 }
 
+_PAGE_SIZE = 50
+
+# what the reply cards and their thread / query headers read
+_CARD_COLUMNS = [
+    "author_name", "author_handle", "text", "tweet_url",
+    "source_detail", "parent_text", "parent_url", "tweet_created_at",
+]
+
+_BUCKET_LABELS = {
+    "product_feedback": "Product Feedback",
+    "feature_request": "Feature Requests",
+    "general_feedback": "General Feedback",
+}
+
+_BUDGET_OPTIONS = {
+    "No limit": None,
+    "30 seconds": 30,
+    "1 minute": 60,
+    "2 minutes": 120,
+    "5 minutes": 300,
+}
+
 
 # ── auth ─────────────────────────────────────────────────────────────
 
@@ -84,7 +107,7 @@ def _check_login():
 
 # ── fetch logic ──────────────────────────────────────────────────────
 
-def _run_fetch(since_dt: datetime):
+def _run_fetch(since_dt: datetime, time_budget: float | None = None, resume: bool = False):
     st.session_state["fetch_log"] = []
     st.session_state["fetch_error"] = None
 
@@ -92,7 +115,9 @@ def _run_fetch(since_dt: datetime):
         st.session_state["fetch_log"].append(msg)
 
     try:
-        new = collect_feedback(since_dt, progress_cb=_progress)
+        new = collect_feedback(
+            since_dt, progress_cb=_progress, time_budget=time_budget, resume=resume,
+        )
         st.session_state["fetch_result_count"] = len(new)
     except Exception as e:
         st.session_state["fetch_error"] = str(e)
@@ -155,11 +180,32 @@ def _dashboard():
         if _CAN_FETCH:
             st.caption("Scrape fresh replies from X for this range")
 
+            budget_label = st.selectbox(
+                "Time budget",
+                list(_BUDGET_OPTIONS),
+                index=0,
+                help="Most productive threads and searches are fetched first; "
+                     "the rest are skipped once the budget runs out.",
+            )
+            time_budget = _BUDGET_OPTIONS[budget_label]
+
             if st.button("Fetch from X", use_container_width=True, type="primary"):
-                with st.spinner("Scraping replies from X… this takes ~2 min"):
-                    _run_fetch(since_dt)
+                wait = f"up to {budget_label}" if time_budget else "~2 min"
+                with st.spinner(f"Scraping replies from X… this takes {wait}"):
+                    _run_fetch(since_dt, time_budget)
                 st.rerun()
 
+            pending = interrupted_run()
+            if pending:
+                st.caption(
+                    f"An earlier fetch stopped after {pending['done']} of "
+                    f"{pending['targets']} threads and searches."
+                )
+                if st.button("Resume interrupted fetch", use_container_width=True):
+                    with st.spinner("Resuming the interrupted fetch…"):
+                        _run_fetch(since_dt, time_budget, resume=True)
+                    st.rerun()
+
             if st.session_state.get("fetch_error"):
                 st.error(st.session_state["fetch_error"])
             elif st.session_state.get("fetch_result_count") is not None:
@@ -178,25 +224,29 @@ def _dashboard():
             st.caption("Fetching is only available when running locally.")
             st.button("Fetch from X", use_container_width=True, disabled=True)
 
-    # ── query DB for the selected window
-    tweets = query_tweets(
-        since_iso=since_dt.isoformat(),
-        until_iso=until_dt.isoformat(),
-    )
-
-    # split by source
-    timeline_tweets = [t for t in tweets if t.get("source_type") == "timeline_reply"]
-    thread_tweets = [t for t in tweets if t.get("source_type") == "thread_reply"]
-    keyword_tweets = [t for t in tweets if t.get("source_type") == "keyword_mention"]
+    # ── count the selected window; rows are fetched a page at a time
+    since_ms, until_ms = to_ms(since_dt), to_ms(until_dt)
+    # preset windows slide with the clock; keep their page across reruns
+    window = selected_range if selected_range != "Custom" else (since_ms, until_ms)
+    stats = window_stats(since_ms, until_ms)
+    total = stats["total"]
+    n_timeline = stats["source_type"].get("timeline_reply", 0)
+    n_threads = stats["source_type"].get("thread_reply", 0)
+    n_keyword = stats["source_type"].get("keyword_mention", 0)
 
     # ── metrics
     c1, c2, c3, c4 = st.columns(4)
-    c1.metric("Total", len(tweets))
-    c2.metric("@SarvamAI Timeline", len(timeline_tweets))
-    c3.metric("Indus Threads", len(thread_tweets))
-    c4.metric("Broader Mentions", len(keyword_tweets))
-
-    if not tweets:
+    c1.metric("Total", total)
+    c2.metric("@SarvamAI Timeline", n_timeline)
+    c3.metric("Indus Threads", n_threads)
+    c4.metric("Broader Mentions", n_keyword)
+    buckets = [
+        f"{label} {stats['bucket'][b]}" for b, label in _BUCKET_LABELS.items() if stats["bucket"].get(b)
+    ]
+    if buckets:
+        st.caption(" · ".join(buckets))
+
+    if not total:
         st.info(
             "No replies found in this window. "
             "Try a wider range or click **Fetch from X** to scrape new data."
@@ -205,34 +255,76 @@ def _dashboard():
 
     # ── three tabs
     tab_timeline, tab_threads, tab_mentions = st.tabs([
-        f"@SarvamAI Timeline ({len(timeline_tweets)})",
-        f"Indus Threads ({len(thread_tweets)})",
-        f"Broader Mentions ({len(keyword_tweets)})",
+        f"@SarvamAI Timeline ({n_timeline})",
+        f"Indus Threads ({n_threads})",
+        f"Broader Mentions ({n_keyword})",
     ])
 
     with tab_timeline:
-        if not timeline_tweets:
+        if not n_timeline:
             st.caption("No timeline replies in this window.")
         else:
-            _render_grouped(timeline_tweets, "@SarvamAI")
+            _paged(
+                "timeline_reply", window, since_ms, until_ms, n_timeline,
+                lambda rows: _render_grouped(rows, "@SarvamAI", stats["thread"]),
+            )
 
     with tab_threads:
-        if not thread_tweets:
+        if not n_threads:
             st.caption("No thread replies in this window.")
         else:
-            _render_grouped(thread_tweets, "Indus")
+            _paged(
+                "thread_reply", window, since_ms, until_ms, n_threads,
+                lambda rows: _render_grouped(rows, "Indus", stats["thread"]),
+            )
 
     with tab_mentions:
-        if not keyword_tweets:
+        if not n_keyword:
             st.caption(
                 "No broader mentions in this window. "
                 "Click **Fetch from X** to search for keyword mentions."
             )
         else:
-            _render_mentions(keyword_tweets)
+            _paged(
+                "keyword_mention", window, since_ms, until_ms, n_keyword,
+                lambda rows: _render_mentions(rows, stats["query"]),
+            )
+
+
+def _paged(source_type: str, window, since_ms: int, until_ms: int, total: int, render):
+    """Fetch and render the page of one source's replies the user is on,
+    with Newer / Older buttons when there is more than one."""
+    key = f"page_{source_type}"
+    state = st.session_state.get(key)
+    if state is None or state["window"] != window:
+        # a new window starts back at the newest page
+        state = st.session_state[key] = {"window": window, "cursors": [None]}
+    elif len(state["cursors"]) > -(-total // _PAGE_SIZE):
+        # a sliding window has shrunk under the page the user was on
+        state["cursors"] = [None]
+
+    rows, cursor = query_page(
+        since_ms, until_ms, after=state["cursors"][-1], limit=_PAGE_SIZE,
+        columns=_CARD_COLUMNS, source_type=source_type,
+    )
+    render(rows)
+
+    if total <= _PAGE_SIZE:
+        return
+    page = len(state["cursors"])
+    col_newer, col_info, col_older = st.columns([1, 2, 1])
+    col_newer.button(
+        "← Newer", key=f"{key}_newer", disabled=page == 1,
+        on_click=state["cursors"].pop, use_container_width=True,
+    )
+    col_info.caption(f"Page {page} of {-(-total // _PAGE_SIZE)}")
+    col_older.button(
+        "Older →", key=f"{key}_older", disabled=cursor is None,
+        on_click=state["cursors"].append, args=(cursor,), use_container_width=True,
+    )
 
 
-def _render_grouped(tweets: list[dict], source_label: str):
+def _render_grouped(tweets: list[dict], source_label: str, counts: dict[str, int]):
     threads = defaultdict(list)
     for t in tweets:
         key = t.get("parent_text") or t.get("source_detail") or "Unknown thread"
@@ -243,6 +335,8 @@ def _render_grouped(tweets: list[dict], source_label: str):
         preview = thread_name[:140] + ("…" if len(thread_name) > 140 else "")
 
         source_detail = replies[0].get("source_detail", "")
+        # the whole window's count; a page may hold only some of them
+        n_replies = counts.get(source_detail, len(replies))
         thread_author = source_detail.split("/")[0] if "/" in source_detail else f"@{source_label}"
 
         thread_link = ""
@@ -257,7 +351,7 @@ def _render_grouped(tweets: list[dict], source_label: str):
             f'<div style="margin-top:24px;margin-bottom:8px;padding:10px 14px;'
             f'background:#16213e;border-radius:8px;border-left:4px solid #1d9bf0;">'
             f'<span style="color:#aaa;font-size:12px;">THREAD by {_esc(thread_author)}'
-            f' · {len(replies)} replies</span>{thread_link}<br>'
+            f' · {n_replies} replies</span>{thread_link}<br>'
             f'<span style="color:#ddd;font-size:14px;">{_esc(preview)}</span>'
             f'</div>',
             unsafe_allow_html=True,
@@ -267,7 +361,7 @@ def _render_grouped(tweets: list[dict], source_label: str):
             _render_reply(t)
 
 
-def _render_mentions(tweets: list[dict]):
+def _render_mentions(tweets: list[dict], counts: dict[str, int]):
     """Render keyword-search results grouped by search query."""
     by_query = defaultdict(list)
     for t in tweets:
@@ -279,7 +373,7 @@ def _render_mentions(tweets: list[dict]):
             f'<div style="margin-top:24px;margin-bottom:8px;padding:10px 14px;'
             f'background:#1e3a2f;border-radius:8px;border-left:4px solid #2ecc71;">'
             f'<span style="color:#aaa;font-size:12px;">SEARCH QUERY'
-            f' · {len(items)} results</span><br>'
+            f' · {counts.get(items[0].get("source_detail"), len(items))} results</span><br>'
             f'<span style="color:#ddd;font-size:14px;">{_esc(query)}</span>'
             f'</div>',
             unsafe_allow_html=True,
@@ -290,7 +384,11 @@ def _render_mentions(tweets: list[dict]):
 
 def _render_reply(t: dict):
     tweet_url = t.get("tweet_url", "")
-    created = t.get("tweet_created_at", "")[:16].replace("T", " ")
+    if t.get("created_ms") is not None:
+        created_dt = datetime.fromtimestamp(t["created_ms"] / 1000, tz=timezone.utc)
+        created = created_dt.strftime("%Y-%m-%d %H:%M")
+    else:
+        created = t.get("tweet_created_at", "")[:16].replace("T", " ")
 
     st.markdown(
         f"""
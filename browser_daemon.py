@@ -0,0 +1,105 @@
+"""
+Warm Browser Daemon
+~~~~~~~~~~~~~~~~~~~
+Keeps one headless Chromium running with an authenticated X session so
+collector runs (cron ticks and the dashboard's "Fetch from X" button)
+can connect over CDP instead of launching a browser and re-adding
+cookies every time. collector.py falls back to a cold launch whenever
+the daemon is not running.
+
+Run:  python browser_daemon.py                 # CDP on 127.0.0.1:9222
+      python browser_daemon.py --port 9333
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+
+from playwright.async_api import async_playwright
+
+from collector import (
+    BASE_DIR,
+    DAEMON_STATE_PATH,
+    LEAN_CHROMIUM_ARGS,
+    USER_AGENT,
+    cookie_paths,
+    load_config,
+    load_x_cookies,
+)
+
+PROFILE_DIR = os.path.join(BASE_DIR, "data", "browser-profile")
+
+log = logging.getLogger("browser_daemon")
+
+
+async def serve(port: int, cookies_path: str, keepalive_min: int, viewport: dict | None):
+    async with async_playwright() as pw:
+        context = await pw.chromium.launch_persistent_context(
+            PROFILE_DIR,
+            headless=True,
+            args=[
+                "--disable-blink-features=AutomationControlled",
+                f"--remote-debugging-port={port}",
+                "--remote-debugging-address=127.0.0.1",
+                *LEAN_CHROMIUM_ARGS,
+            ],
+            viewport=viewport or {"width": 1280, "height": 900},
+            user_agent=USER_AGENT,
+        )
+        try:
+            await context.add_cookies(load_x_cookies(cookies_path))
+            cookies_mtime = os.path.getmtime(cookies_path)
+
+            # one page stays on x.com so the session and caches stay warm
+            page = context.pages[0] if context.pages else await context.new_page()
+            await page.goto("https://x.com/home", wait_until="domcontentloaded")
+
+            endpoint = f"http://127.0.0.1:{port}"
+            with open(DAEMON_STATE_PATH, "w") as f:
+                json.dump({"endpoint": endpoint, "pid": os.getpid()}, f)
+            log.info("Warm browser ready at %s", endpoint)
+
+            while True:
+                await asyncio.sleep(keepalive_min * 60)
+                mtime = os.path.getmtime(cookies_path)
+                if mtime != cookies_mtime:
+                    await context.add_cookies(load_x_cookies(cookies_path))
+                    cookies_mtime = mtime
+                    log.info("Reloaded cookies from %s", cookies_path)
+                try:
+                    await page.reload(wait_until="domcontentloaded")
+                except Exception as e:
+                    log.warning("Keepalive reload failed: %s", e)
+        finally:
+            if os.path.exists(DAEMON_STATE_PATH):
+                os.remove(DAEMON_STATE_PATH)
+            await context.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keep a warm, logged-in browser for collector runs")
+    parser.add_argument("--port", type=int, default=9222, help="CDP port (default 9222)")
+    parser.add_argument(
+        "--keepalive", type=int, default=15,
+        help="Minutes between session keepalive reloads (default 15)",
+    )
+    args = parser.parse_args()
+
+    config = load_config()
+    # collector runs use the daemon's context for their first account
+    jars = cookie_paths(config)
+    if not jars:
+        raise SystemExit("No cookies found. Run login_helper.py first.")
+    cookies_path = jars[0]
+
+    viewport = config.get("collector", {}).get("viewport")
+    try:
+        asyncio.run(serve(args.port, cookies_path, args.keepalive, viewport))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+Reply Classifier
+~~~~~~~~~~~~~~~~
+Sorts replies into feature_request / product_feedback / general_feedback
+by counting which of each bucket's signal phrases they contain.
+
+All signal lists are compiled into one trie regex (see ``matcher``) and
+each text is scanned once. Signals match whole words only, so "ui" no
+longer fires inside "build" or "lag" inside "flagship"; a trailing ``*``
+marks a stem, which must start a word but may run on ("feature*" takes
+"features", "crash*" takes "crashed"). Bump ``CLASSIFIER_VERSION``
+whenever the lists or the rules change.
+
+Rows are classified as they are inserted; rows stored by an older
+classifier version are redone in the background by ``reclassify_stale``.
+
+Run:  python classifier.py --reclassify       # bring stored rows up to date
+      python classifier.py --bench [N]        # throughput on N synthetic replies
+"""
+
+import argparse
+import logging
+import random
+import time
+
+from db import get_stale_classifications, init_db, update_classifications
+from matcher import TermMatcher
+
+log = logging.getLogger("collector")
+
+CLASSIFIER_VERSION = 3
+
+_FEATURE_REQUEST_SIGNALS = [
+    "feature*", "request*", "add support", "please add", "should have",
+    "would be nice", "wish it", "wish there", "missing", "needs to",
+    "need to add", "can you add", "could you add", "want to see",
+    "roadmap*", "upcoming", "when will", "support for", "integrate*",
+    "integration*", "add option", "option to", "ability to",
+    "pls add", "plz add", "should add", "we need", "i need",
+]
+
+_PRODUCT_FEEDBACK_SIGNALS = [
+    "bug*", "buggy", "crash*", "crashes", "crashing", "glitch*", "laggy",
+    "lag", "slow*", "fast", "smooth", "broken", "error*", "fix*",
+    "heating", "heats up", "heat up", "heatup", "hot", "overheat*",
+    "battery", "drain*", "login", "log in", "sign in", "signin",
+    "can't open", "cannot open", "not working", "doesn't work",
+    "not loading", "loading", "stuck", "freeze*", "froze",
+    "ui", "interface", "dark mode", "font*", "layout*",
+    "notification*", "update*", "version*", "install*", "uninstall",
+    "accurate", "inaccurate", "wrong answer", "correct answer",
+    "hallucin*", "response*", "speed", "latency", "timeout*",
+    "voice", "mic", "audio", "camera", "upload*", "download*",
+    "app", "indus app", "the app", "this app", "your app",
+    "tried it", "tried the", "using it", "used it", "tested",
+    "experience", "usability", "performance", "quality",
+    "underrated", "overrated", "impressed", "disappointing",
+    "love the app", "love this app", "hate the app",
+    "smooth experience", "bad experience", "good experience",
+    "awesome app", "amazing app", "great app", "terrible app",
+    "sucks", "fantastic", "solid app", "best app", "worst app",
+    "playstore", "play store", "app store",
+    "refinement", "polish*", "improve*",
+]
+
+_GENERAL_FEEDBACK_SIGNALS = [
+    "proud", "congratulations", "congrats", "kudos", "bravo",
+    "all the best", "best wishes", "good luck", "keep it up",
+    "great initiative", "great work", "good work", "amazing work",
+    "game changer", "game-changer", "revolutionary",
+    "future", "potential", "promising", "exciting",
+    "india*", "bharat", "desi", "indigenous", "sovereign*",
+    "startup*", "company", "team*", "funding", "invest*",
+    "compete", "competition", "chatgpt", "grok", "gemini",
+    "business*", "market*", "industry",
+    "partnership", "partner*", "collab*",
+]
+
+
+BUCKETS = ("feature_request", "product_feedback", "general_feedback")
+
+_SIGNALS = {
+    "feature_request": _FEATURE_REQUEST_SIGNALS,
+    "product_feedback": _PRODUCT_FEEDBACK_SIGNALS,
+    "general_feedback": _GENERAL_FEEDBACK_SIGNALS,
+}
+
+
+class Classifier:
+    """Bucket signals compiled into one matcher; score and classify texts."""
+
+    def __init__(self, signals: dict[str, list[str]] | None = None):
+        signals = signals or _SIGNALS
+        self.buckets = tuple(signals)
+        self._term_buckets: dict[str, list[str]] = {}
+        for bucket, terms in signals.items():
+            for term in terms:
+                self._term_buckets.setdefault(term, []).append(bucket)
+        self._matcher = TermMatcher(list(self._term_buckets), whole_words=True)
+
+    def scores(self, text: str) -> dict[str, int]:
+        """Number of distinct signals from each bucket found in ``text``."""
+        counts = dict.fromkeys(self.buckets, 0)
+        for term in self._matcher.findall(text or ""):
+            for bucket in self._term_buckets[term]:
+                counts[bucket] += 1
+        return counts
+
+    def classify(self, text: str) -> str:
+        return pick_bucket(self.scores(text))
+
+    def classify_many(self, texts) -> list[str]:
+        return [pick_bucket(self.scores(t)) for t in texts]
+
+
+def pick_bucket(scores: dict[str, int]) -> str:
+    """Feature requests win ties, then product feedback; with no signals
+    at all a reply counts as general feedback."""
+    fr = scores.get("feature_request", 0)
+    pf = scores.get("product_feedback", 0)
+    gf = scores.get("general_feedback", 0)
+    if fr > 0 and fr >= pf and fr >= gf:
+        return "feature_request"
+    if pf > 0 and pf >= gf:
+        return "product_feedback"
+    return "general_feedback"
+
+
+_default: Classifier | None = None
+
+
+def _classifier() -> Classifier:
+    global _default
+    if _default is None:
+        _default = Classifier()
+    return _default
+
+
+def bucket_scores(text: str) -> dict[str, int]:
+    return _classifier().scores(text)
+
+
+def classify(text: str) -> str:
+    return _classifier().classify(text)
+
+
+def classify_many(texts) -> list[str]:
+    """Classify a batch of texts; same result as ``classify`` on each."""
+    return _classifier().classify_many(texts)
+
+
+def classify_rows(rows: list[dict]) -> list[dict]:
+    """Set ``bucket``, ``bucket_scores`` and ``classifier_version`` on
+    tweet rows in place, ready for ``db.insert_tweets``."""
+    classifier = _classifier()
+    for row in rows:
+        scores = classifier.scores(row.get("text", ""))
+        row.update(
+            bucket=pick_bucket(scores), bucket_scores=scores,
+            classifier_version=CLASSIFIER_VERSION,
+        )
+    return rows
+
+
+def reclassify_stale(batch_size: int = 500) -> int:
+    """Reclassify stored rows whose classifier version is older than
+    ``CLASSIFIER_VERSION``, one transaction per batch. Returns the count.
+
+    Safe to run alongside a collection run: rows inserted meanwhile are
+    already current, and each batch is a short write.
+    """
+    done = 0
+    last_rowid = 0
+    while True:
+        rows = get_stale_classifications(CLASSIFIER_VERSION, last_rowid, batch_size)
+        if not rows:
+            break
+        update_classifications(classify_rows(rows), CLASSIFIER_VERSION)
+        last_rowid = rows[-1]["rowid"]
+        done += len(rows)
+    if done:
+        log.info("Reclassified %d stored replies (classifier v%d)", done, CLASSIFIER_VERSION)
+    return done
+
+
+# ── benchmark ────────────────────────────────────────────────────────
+
+def _substring_classify(text: str) -> str:
+    # the original per-keyword ``in`` scan, kept for comparison
+    lower = text.lower()
+    return pick_bucket({
+        bucket: sum(1 for kw in terms if kw.rstrip("*") in lower)
+        for bucket, terms in _SIGNALS.items()
+    })
+
+
+def _sample_texts(n: int) -> list[str]:
+    filler = (
+        "this is honestly the best thing i have seen from an indian startup "
+        "so far but the app keeps crashing on my phone when i open the camera "
+        "please add dark mode and support for more languages congrats team "
+    ).split()
+    signals = [t.rstrip("*") for terms in _SIGNALS.values() for t in terms]
+    rng = random.Random(0)
+    return [
+        " ".join(rng.choice(filler if rng.random() < 0.9 else signals) for _ in range(rng.randint(8, 45)))
+        for _ in range(n)
+    ]
+
+
+def _bench(n: int):
+    texts = _sample_texts(n)
+    classifier = Classifier()
+    for label, fn in (
+        ("substring scan", lambda: [_substring_classify(t) for t in texts]),
+        ("compiled", lambda: classifier.classify_many(texts)),
+    ):
+        started = time.perf_counter()
+        fn()
+        secs = time.perf_counter() - started
+        print(f"{label:>15}: {n} texts in {secs:.2f}s ({n / secs:,.0f}/s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reply classifier")
+    parser.add_argument("--reclassify", action="store_true",
+                        help="Reclassify stored replies from older classifier versions")
+    parser.add_argument("--bench", type=int, nargs="?", const=100_000, metavar="N",
+                        help="Time classify_many on N synthetic replies (default 100000)")
+    args = parser.parse_args()
+    if args.reclassify:
+        init_db()
+        print(f"Reclassified {reclassify_stale()} replies")
+    elif args.bench:
+        _bench(args.bench)
+    else:
+        parser.print_help()
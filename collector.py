@@ -2,31 +2,65 @@
 Indus Feedback Collector
 ~~~~~~~~~~~~~~~~~~~~~~~~
 Scans @SarvamAI's tweets, opens each one, and collects all replies.
-Classifies replies into: feedback / feature_request.
+Classifies replies into product_feedback / feature_request / general_feedback.
 
 Usage:
   python collector.py                              # last 24 hours (default)
   python collector.py --since "2026-02-25"         # from a specific date
   python collector.py --since 7d                   # last 7 days
   python collector.py --since 2w                   # last 2 weeks
+  python collector.py --time-budget 2m             # spend at most ~2 minutes
+  python collector.py --resume                     # finish an interrupted run
 """
 
 import argparse
 import asyncio
+import functools
 import json
 import logging
 import os
 import re
 import sys
+import time
 from datetime import datetime, timedelta, timezone
+from urllib.parse import urlparse
 
 import yaml
 from playwright.async_api import async_playwright
 
 from twikit import Client
-
-from db import init_db, insert_tweet
+from twikit.errors import AccountLocked, AccountSuspended, TooManyRequests, Unauthorized
+
+from classifier import classify_rows, reclassify_stale
+from db import (
+    finish_run,
+    finish_run_target,
+    get_last_run,
+    get_reply_ids,
+    get_run_targets,
+    get_target_history,
+    get_target_yields,
+    get_thread_states,
+    init_db,
+    insert_tweets,
+    record_target_yield,
+    reopen_run,
+    start_run,
+    update_thread_state,
+)
+from matcher import RelevanceFilter
 from notifier import export_to_csv, send_email_digest
+from query_plan import attributor, plan_queries
+from ratelimit import PastDeadline, RequestScheduler
+from timeutil import parse_timestamp, snowflake_time
+from x_graphql import (
+    SEARCH_TIMELINE,
+    TWEET_DETAIL,
+    conversation_replies,
+    extract_tweets,
+    is_graphql_url,
+    to_iso,
+)
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
@@ -70,88 +104,27 @@ def parse_since(value: str | None) -> datetime:
     return datetime.now(timezone.utc) - timedelta(hours=24)
 
 
-def tweet_is_after(created_at: str, since: datetime) -> bool:
-    if not created_at:
-        return True
-    for fmt in (
-        "%a %b %d %H:%M:%S %z %Y",
-        "%Y-%m-%dT%H:%M:%S%z",
-        "%Y-%m-%dT%H:%M:%S.%f%z",
-        "%Y-%m-%d %H:%M:%S",
-        "%Y-%m-%d",
-    ):
-        try:
-            dt = datetime.strptime(created_at, fmt)
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-            return dt >= since
-        except ValueError:
-            continue
-    return True
-
-
-# ── classifier ───────────────────────────────────────────────────────
+_DURATION_RE = re.compile(r"^(\d+(?:\.\d+)?)\s*(s|m|h)?$", re.IGNORECASE)
+_DURATION_SECONDS = {"s": 1, "m": 60, "h": 3600}
 
-_FEATURE_REQUEST_SIGNALS = [
-    "feature", "request", "add support", "please add", "should have",
-    "would be nice", "wish it", "wish there", "missing", "needs to",
-    "need to add", "can you add", "could you add", "want to see",
-    "roadmap", "upcoming", "when will", "support for", "integrate",
-    "integration", "add option", "option to", "ability to",
-    "pls add", "plz add", "should add", "we need", "i need",
-]
-
-_PRODUCT_FEEDBACK_SIGNALS = [
-    "bug", "buggy", "crash", "crashes", "crashing", "glitch", "laggy",
-    "lag", "slow", "fast", "smooth", "broken", "error", "fix",
-    "heating", "heats up", "heat up", "heatup", "hot", "overheat",
-    "battery", "drain", "login", "log in", "sign in", "signin",
-    "can't open", "cannot open", "not working", "doesn't work",
-    "not loading", "loading", "stuck", "freeze", "froze",
-    "ui", "interface", "dark mode", "font", "layout",
-    "notification", "update", "version", "install", "uninstall",
-    "accurate", "inaccurate", "wrong answer", "correct answer",
-    "hallucin", "response", "speed", "latency", "timeout",
-    "voice", "mic", "audio", "camera", "upload", "download",
-    "app", "indus app", "the app", "this app", "your app",
-    "tried it", "tried the", "using it", "used it", "tested",
-    "experience", "usability", "performance", "quality",
-    "underrated", "overrated", "impressed", "disappointing",
-    "love the app", "love this app", "hate the app",
-    "smooth experience", "bad experience", "good experience",
-    "awesome app", "amazing app", "great app", "terrible app",
-    "sucks", "fantastic", "solid app", "best app", "worst app",
-    "playstore", "play store", "app store",
-    "refinement", "polish", "improve",
-]
-
-_GENERAL_FEEDBACK_SIGNALS = [
-    "proud", "congratulations", "congrats", "kudos", "bravo",
-    "all the best", "best wishes", "good luck", "keep it up",
-    "great initiative", "great work", "good work", "amazing work",
-    "game changer", "game-changer", "revolutionary",
-    "future", "potential", "promising", "exciting",
-    "india", "bharat", "desi", "indigenous", "sovereign",
-    "startup", "company", "team", "funding", "invest",
-    "compete", "competition", "chatgpt", "grok", "gemini",
-    "business", "market", "industry",
-    "partnership", "partner", "collab",
-]
 
+def parse_duration(value: str | None) -> float | None:
+    """Parse "90", "90s", "5m" or "1h" into seconds; None means no limit."""
+    if not value:
+        return None
+    match = _DURATION_RE.match(value.strip())
+    if not match:
+        log.warning("Could not parse duration '%s', ignoring", value)
+        return None
+    unit = (match.group(2) or "s").lower()
+    return float(match.group(1)) * _DURATION_SECONDS[unit]
 
-def classify_bucket(text: str) -> str:
-    lower = text.lower()
-    fr = sum(1 for kw in _FEATURE_REQUEST_SIGNALS if kw in lower)
-    pf = sum(1 for kw in _PRODUCT_FEEDBACK_SIGNALS if kw in lower)
-    gf = sum(1 for kw in _GENERAL_FEEDBACK_SIGNALS if kw in lower)
 
-    if fr > 0 and fr >= pf and fr >= gf:
-        return "feature_request"
-    if pf > 0 and pf >= gf:
-        return "product_feedback"
-    if gf > 0:
-        return "general_feedback"
-    return "general_feedback"
+def tweet_is_after(created_at: str, since: datetime, source: str = "") -> bool:
+    if not created_at:
+        return True
+    dt = parse_timestamp(created_at, source)
+    return dt is None or dt >= since
 
 
 # ── helpers ──────────────────────────────────────────────────────────
@@ -163,27 +136,80 @@ def load_config() -> dict:
 
 # ── Step 1: get @SarvamAI tweets via twikit ──────────────────────────
 
-async def get_sarvam_tweet_ids(cookies_path: str, handle: str, since: datetime) -> list[dict]:
-    """Fetch recent tweets from @SarvamAI and return their IDs + metadata."""
+def _twikit_client(cookies_path: str) -> Client:
     client = Client("en-US")
     client.load_cookies(cookies_path)
+    return client
+
+
+USER_ID_CACHE_PATH = os.path.join(BASE_DIR, "data", "user_ids.json")
+
+
+async def _resolve_user_id(client, handle: str) -> str:
+    """Look up a handle's user ID once and remember it on disk."""
+    try:
+        with open(USER_ID_CACHE_PATH, "r") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+
+    key = handle.lower()
+    if key not in cache:
+        user = await client.get_user_by_screen_name(handle)
+        cache[key] = str(user.id)
+        with open(USER_ID_CACHE_PATH, "w") as f:
+            json.dump(cache, f, indent=2)
+    return cache[key]
+
+
+async def get_sarvam_tweet_ids(
+    cookies_path: str, handle: str, since: datetime,
+    page_size: int = 20, max_pages: int = 25, client: Client | None = None,
+    pace=None,
+) -> list[dict]:
+    """Fetch recent tweets from @SarvamAI and return their IDs + metadata.
+
+    Pages through the timeline with twikit's cursor until it passes
+    ``since``. The first tweet is not taken as the cutoff because it may
+    be an old pinned tweet. ``pace``, if given, is awaited before each
+    API call.
+    """
+    if client is None:
+        client = _twikit_client(cookies_path)
 
     log.info("Fetching tweets from @%s…", handle)
-    user = await client.get_user_by_screen_name(handle)
-    tweets = await client.get_user_tweets(user.id, "Tweets", count=40)
+    user_id = await _resolve_user_id(client, handle)
+    if pace:
+        await pace()
+    tweets = await client.get_user_tweets(user_id, "Tweets", count=page_size)
 
     results = []
-    if tweets:
+    seen_ids: set[str] = set()
+    first = True
+    for _ in range(max_pages):
+        if not tweets:
+            break
+        passed_cutoff = False
         for tweet in tweets:
+            tweet_id = str(tweet.id)
             created = str(tweet.created_at) if tweet.created_at else ""
-            if tweet_is_after(created, since):
+            if not tweet_is_after(created, since, "twikit"):
+                passed_cutoff = passed_cutoff or not first
+            elif tweet_id not in seen_ids:
+                seen_ids.add(tweet_id)
                 text_preview = (tweet.text or "")[:80].replace("\n", " ")
                 results.append({
-                    "tweet_id": str(tweet.id),
+                    "tweet_id": tweet_id,
                     "handle": tweet.user.screen_name if tweet.user else handle,
                     "text_preview": text_preview,
                     "reply_count": getattr(tweet, "reply_count", 0) or 0,
                 })
+            first = False
+        if passed_cutoff or not tweets.next_cursor:
+            break
+        if pace:
+            await pace()
+        tweets = await tweets.next()
 
     log.info("  -> %d tweets from @%s in date range", len(results), handle)
     return results
@@ -191,219 +217,1381 @@ async def get_sarvam_tweet_ids(cookies_path: str, handle: str, since: datetime)
 
 # ── Step 2: scrape replies from each tweet via Playwright ────────────
 
-_TWEET_LINK_RE = re.compile(r"/(\w+)/status/(\d+)")
+# Resource types and hosts a "lean" profile never loads; we only read text.
+_BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+_BLOCKED_URL_PARTS = (
+    "/i/jot",
+    "/1.1/jot/",
+    "client_event",
+    "/i/api/1.1/keyword/",
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "ads-twitter.com",
+    "ads-api.x.com",
+    "analytics.x.com",
+)
 
+LEAN_CHROMIUM_ARGS = [
+    "--disable-gpu",
+    "--disable-dev-shm-usage",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-renderer-backgrounding",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--mute-audio",
+    "--no-first-run",
+    "--blink-settings=imagesEnabled=false",
+    "--js-flags=--max-old-space-size=256",
+]
 
-async def _create_browser_context(pw, cookies_path: str):
-    browser = await pw.chromium.launch(
-        headless=True,
-        args=["--disable-blink-features=AutomationControlled"],
-    )
-    context = await browser.new_context(
-        viewport={"width": 1280, "height": 900},
-        user_agent=(
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/131.0.0.0 Safari/537.36"
-        ),
-    )
-    await context.add_init_script(
-        "Object.defineProperty(navigator, 'webdriver', { get: () => false });"
-    )
 
+class _NetStats:
+    """Bytes, request counts and page load times for one browser context."""
+
+    def __init__(self):
+        self.bytes = 0
+        self.requests = 0
+        self.blocked = 0
+        self.load_times: list[float] = []
+        self._nav_start: dict = {}
+        self._pending: set[asyncio.Future] = set()
+
+    def attach(self, context):
+        context.on("request", self._on_request)
+        context.on("requestfinished", self._on_finished)
+        context.on("page", self._on_page)
+
+    def _on_page(self, page):
+        page.on("domcontentloaded", self._on_loaded)
+
+    def _on_request(self, request):
+        if request.is_navigation_request() and request.frame.parent_frame is None:
+            self._nav_start[request.frame] = time.monotonic()
+
+    def _on_loaded(self, page):
+        start = self._nav_start.pop(page.main_frame, None)
+        if start is not None:
+            self.load_times.append(time.monotonic() - start)
+
+    def _on_finished(self, request):
+        self.requests += 1
+        task = asyncio.ensure_future(self._add_size(request))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _add_size(self, request):
+        try:
+            sizes = await request.sizes()
+        except Exception:
+            return
+        self.bytes += sizes["responseBodySize"] + sizes["responseHeadersSize"]
+
+    async def summary(self) -> str:
+        if self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+        avg = sum(self.load_times) / len(self.load_times) if self.load_times else 0
+        return (
+            f"Network: {self.bytes / 1_048_576:.1f} MB over {self.requests} requests "
+            f"({self.blocked} blocked), avg page load {avg:.2f}s "
+            f"across {len(self.load_times)} pages"
+        )
+
+
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/131.0.0.0 Safari/537.36"
+)
+
+# Written by browser_daemon.py while a warm browser is running
+DAEMON_STATE_PATH = os.path.join(BASE_DIR, "data", "browser_daemon.json")
+
+
+def load_x_cookies(cookies_path: str) -> list[dict]:
+    """Read the twikit-style cookie dict and convert it for Playwright."""
     with open(cookies_path, "r") as f:
         raw_cookies = json.load(f)
-
-    pw_cookies = [
+    return [
         {"name": n, "value": v, "domain": ".x.com", "path": "/"}
         for n, v in raw_cookies.items()
     ]
-    await context.add_cookies(pw_cookies)
-    return browser, context
 
 
-async def search_keyword_tweets(
-    context, query: str, exclude_terms: list[str],
-    relevance_signals: list[str],
-    since: datetime, max_scrolls: int = 5,
-) -> list[dict]:
-    """Search X for a query and collect matching tweets, with relevance filtering."""
-    results = []
-    seen_ids: set[str] = set()
+async def _prepare_context(
+    context, cookies_path: str, lean: bool, stats: _NetStats | None = None,
+) -> _NetStats:
+    await context.add_init_script(
+        "Object.defineProperty(navigator, 'webdriver', { get: () => false });"
+    )
 
+    stats = stats or _NetStats()
+    stats.attach(context)
+
+    if lean:
+        async def _block(route):
+            request = route.request
+            if request.resource_type in _BLOCKED_RESOURCE_TYPES or any(
+                part in request.url for part in _BLOCKED_URL_PARTS
+            ):
+                stats.blocked += 1
+                await route.abort()
+            else:
+                await route.continue_()
+
+        await context.route("**/*", _block)
+
+    await context.add_cookies(load_x_cookies(cookies_path))
+    return stats
+
+
+async def _new_context(browser, cookies_path: str, collector_cfg: dict, stats: _NetStats):
+    """Open another logged-in context (for another account) in ``browser``."""
+    context = await browser.new_context(
+        viewport=collector_cfg.get("viewport") or {"width": 1280, "height": 900},
+        user_agent=USER_AGENT,
+    )
+    await _prepare_context(
+        context, cookies_path, collector_cfg.get("profile", "lean") == "lean", stats,
+    )
+    return context
+
+
+async def _create_browser_context(
+    pw, cookies_path: str, profile: str = "lean", viewport: dict | None = None,
+    stats: _NetStats | None = None,
+):
+    """Launch Chromium and return (browser, context, stats).
+
+    The ``lean`` profile adds memory-saving launch flags and aborts
+    images, media, fonts and telemetry requests; ``full`` loads pages
+    as a normal browser would.
+    """
+    lean = profile == "lean"
+    args = ["--disable-blink-features=AutomationControlled"]
+    if lean:
+        args += LEAN_CHROMIUM_ARGS
+    browser = await pw.chromium.launch(headless=True, args=args)
+    context = await browser.new_context(
+        viewport=viewport or {"width": 1280, "height": 900},
+        user_agent=USER_AGENT,
+    )
+    stats = await _prepare_context(context, cookies_path, lean, stats)
+    return browser, context, stats
+
+
+def _daemon_endpoint(collector_cfg: dict) -> str | None:
+    endpoint = collector_cfg.get("browser_endpoint")
+    if endpoint:
+        return endpoint
+    try:
+        with open(DAEMON_STATE_PATH, "r") as f:
+            return json.load(f).get("endpoint")
+    except (OSError, ValueError):
+        return None
+
+
+async def _open_browser(pw, cookies_path: str, collector_cfg: dict, stats: _NetStats | None = None):
+    """Connect to the warm browser daemon if one is up, else launch cold.
+
+    Returns (browser, context, stats). Closing a connected browser only
+    disconnects; the daemon and its authenticated context stay up.
+    """
+    profile = collector_cfg.get("profile", "lean")
+    endpoint = _daemon_endpoint(collector_cfg)
+    if endpoint:
+        try:
+            browser = await pw.chromium.connect_over_cdp(endpoint, timeout=3000)
+        except Exception as e:
+            log.info("Browser daemon at %s unavailable (%s), launching cold", endpoint, e)
+        else:
+            if browser.contexts:
+                context = browser.contexts[0]
+                stats = await _prepare_context(context, cookies_path, profile == "lean", stats)
+                log.info("Connected to warm browser at %s", endpoint)
+                return browser, context, stats
+            await browser.close()
+
+    return await _create_browser_context(
+        pw, cookies_path, profile=profile, viewport=collector_cfg.get("viewport"),
+        stats=stats,
+    )
+
+
+def _search_url(query: str, since: datetime) -> tuple[str, str]:
+    """Return (search_url, encoded_query) for a latest-first X search."""
     since_str = since.strftime("%Y-%m-%d")
     until_str = (datetime.now(timezone.utc) + timedelta(days=1)).strftime("%Y-%m-%d")
     full_query = f"{query} since:{since_str} until:{until_str}"
     encoded = full_query.replace(" ", "%20").replace('"', "%22")
-    search_url = f"https://x.com/search?q={encoded}&src=typed_query&f=latest"
+    return f"https://x.com/search?q={encoded}&src=typed_query&f=latest", encoded
 
-    page = await context.new_page()
+
+class SessionBlocked(Exception):
+    """X refused this session (login wall or rate limit)."""
+
+
+_LOGIN_WALL_PARTS = ("/i/flow/login", "/login?", "/account/access")
+
+
+class _GraphQLCapture:
+    """Collects tweets from X's GraphQL responses while a page is scrolled.
+
+    With ``focal_id`` (a thread's own tweet) only replies in its
+    conversation are kept, not its ancestors or suggested tweets.
+    """
+
+    def __init__(self, page, operations: tuple[str, ...], focal_id: str | None = None):
+        self.page = page
+        self.operations = operations
+        self.focal_id = focal_id
+        self.conversation_id = None
+        self.payloads = 0
+        self._buffer: list[dict] = []
+        self._pending: set[asyncio.Future] = set()
+        self._attached = False
+
+    def attach(self):
+        self.page.on("response", self._on_response)
+        self._attached = True
+
+    def detach(self):
+        if self._attached:
+            self.page.remove_listener("response", self._on_response)
+            self._attached = False
+
+    def _on_response(self, response):
+        if not is_graphql_url(response.url, self.operations):
+            return
+        task = asyncio.ensure_future(self._read(response))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _read(self, response):
+        try:
+            payload = await response.json()
+        except Exception:
+            return
+        self.payloads += 1
+        tweets = extract_tweets(payload)
+        if self.focal_id:
+            # the first payload holds the focal tweet itself; later
+            # pages only have replies
+            for t in tweets:
+                if t["id"] == self.focal_id and t["conversation_id"]:
+                    self.conversation_id = t["conversation_id"]
+            tweets = conversation_replies(tweets, self.focal_id, self.conversation_id)
+        self._buffer.extend(tweets)
+
+    async def drain(self) -> list[dict]:
+        """Return tweets parsed since the last drain."""
+        if self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+        batch, self._buffer = self._buffer, []
+        return batch
+
+
+# Reads every rendered tweet article in one round trip. Takes the IDs
+# already seen (plus the thread's own ID) and skips them in the browser.
+# With a filter (RelevanceFilter.js()), rejected tweets come back as
+# bare {id, rejected} so their text never crosses CDP.
+_EXTRACT_ARTICLES_JS = r"""
+([seen, skipId, filter]) => {
+    const seenIds = new Set(seen);
+    const compile = p => p ? new RegExp(p.source, p.flags) : null;
+    const exclude = filter ? compile(filter.exclude) : null;
+    const signals = filter ? compile(filter.signals) : null;
+    const out = [];
+    for (const article of document.querySelectorAll('article[data-testid="tweet"]')) {
+        const link = article.querySelector('a[href*="/status/"]');
+        if (!link) continue;
+        const match = (link.getAttribute("href") || "").match(/\/(\w+)\/status\/(\d+)/);
+        if (!match) continue;
+        const [, handle, id] = match;
+        if (id === skipId || seenIds.has(id)) continue;
+        seenIds.add(id);
+
+        const textEl = article.querySelector('[data-testid="tweetText"]');
+        const text = textEl ? textEl.innerText : "";
+        if (filter && ((exclude && exclude.test(text))
+                || !(signals && signals.test(text + " " + handle)))) {
+            out.push({id, rejected: true});
+            continue;
+        }
+        const nameEl = article.querySelector('[data-testid="User-Name"] span');
+        const timeEl = article.querySelector("time");
+        out.push({
+            id,
+            handle,
+            name: nameEl ? nameEl.innerText : handle,
+            text,
+            created_at: timeEl ? timeEl.getAttribute("datetime") || "" : "",
+        });
+    }
+    return out;
+}
+"""
+
+
+async def _extract_dom(
+    page, seen_ids: set[str], skip_id: str | None = None, keep=None,
+) -> list[dict]:
+    """Read unseen tweets from the rendered ``article`` elements.
+
+    A ``RelevanceFilter`` as ``keep`` is applied in the page.
+    """
+    spec = keep.js() if isinstance(keep, RelevanceFilter) else None
     try:
-        await page.goto(search_url, wait_until="domcontentloaded")
-        await page.wait_for_timeout(4000)
+        batch = await page.evaluate(_EXTRACT_ARTICLES_JS, [list(seen_ids), skip_id, spec])
+    except Exception as e:
+        log.warning("DOM extraction failed: %s", e)
+        return []
+    for t in batch:
+        if not t.get("rejected"):
+            t.update(likes=0, retweets=0, replies=0)
+    return batch
+
+
+# Scrolls one step and reports where the page ended up.
+_SCROLL_JS = """
+() => {
+    window.scrollBy(0, 2000);
+    const el = document.scrollingElement || document.documentElement;
+    return {
+        height: el.scrollHeight,
+        atBottom: window.innerHeight + window.scrollY >= el.scrollHeight - 4,
+    };
+}
+"""
 
-        exclude_lower = [t.lower() for t in exclude_terms]
-        signal_lower = [s.lower() for s in relevance_signals]
+_HEIGHT_GREW_JS = "h => (document.scrollingElement || document.documentElement).scrollHeight > h"
 
-        for _ in range(max_scrolls):
-            articles = await page.query_selector_all('article[data-testid="tweet"]')
 
-            for article in articles:
-                try:
-                    link_el = await article.query_selector('a[href*="/status/"]')
-                    if not link_el:
-                        continue
-                    href = await link_el.get_attribute("href") or ""
-                    match = _TWEET_LINK_RE.search(href)
-                    if not match:
-                        continue
-
-                    username = match.group(1)
-                    tweet_id = match.group(2)
-                    if tweet_id in seen_ids:
-                        continue
-                    seen_ids.add(tweet_id)
-
-                    text_el = await article.query_selector('[data-testid="tweetText"]')
-                    text = await text_el.inner_text() if text_el else ""
-
-                    text_lower = text.lower()
-                    handle_lower = username.lower()
-
-                    # drop if it contains an exclude term
-                    if any(ex in text_lower for ex in exclude_lower):
-                        continue
-
-                    # must contain at least one relevance signal in text or handle
-                    combined = text_lower + " " + handle_lower
-                    if not any(sig in combined for sig in signal_lower):
-                        continue
-
-                    name_el = await article.query_selector(
-                        '[data-testid="User-Name"] span'
-                    )
-                    display_name = await name_el.inner_text() if name_el else username
-
-                    time_el = await article.query_selector("time")
-                    created_at = ""
-                    if time_el:
-                        created_at = await time_el.get_attribute("datetime") or ""
-
-                    results.append({
-                        "tweet_id": tweet_id,
-                        "author_name": display_name,
-                        "author_handle": username,
-                        "text": text,
-                        "tweet_url": f"https://x.com/{username}/status/{tweet_id}",
-                        "source_type": "keyword_mention",
-                        "source_detail": query,
-                        "parent_text": query,
-                        "parent_url": f"https://x.com/search?q={encoded}&f=latest",
-                        "likes": 0,
-                        "retweets": 0,
-                        "replies": 0,
-                        "tweet_created_at": created_at,
-                        "collected_at": datetime.now(timezone.utc).isoformat(),
-                    })
-                except Exception:
-                    continue
+async def _scroll(page, wait_ms: int) -> bool:
+    """Scroll one step. Returns False once the page is at the bottom and
+    nothing more loaded within ``wait_ms``."""
+    pos = await page.evaluate(_SCROLL_JS)
+    if not pos["atBottom"]:
+        await page.wait_for_timeout(wait_ms)
+        return True
+    try:
+        await page.wait_for_function(_HEIGHT_GREW_JS, arg=pos["height"], timeout=wait_ms)
+    except Exception:
+        return False
+    return True
+
 
-            await page.evaluate("window.scrollBy(0, 2000)")
-            await page.wait_for_timeout(2000)
+class _StopRules:
+    """Early-termination rules shared by page scrolling and API paging.
+
+    ``check`` is called after each scroll/page with the IDs it surfaced
+    and returns a stop reason, or None to go one step further. Stops
+    after ``stall_limit`` steps with no new IDs, once every new tweet in
+    a step is older than ``cutoff`` (judged from the ID alone), after
+    ``known_steps`` scrolls in a row that turn up only ``known_ids``
+    (replies already stored), after ``max_steps``, or once ``deadline``
+    (a ``time.monotonic()`` value) has passed.
+    """
+
+    def __init__(
+        self, max_steps: int, stall_limit: int = 2,
+        cutoff: datetime | None = None, known_ids: set[str] | None = None,
+        known_steps: int = 2, deadline: float | None = None,
+    ):
+        self.max_steps = max_steps
+        self.stall_limit = stall_limit
+        self.cutoff = cutoff
+        self.known_ids = known_ids or set()
+        self.known_steps = known_steps
+        self.deadline = deadline
+        self.steps = 0
+        self._stalls = 0
+        self._known = 0
+
+    def check(self, new_ids: list[str]) -> str | None:
+        self._stalls = 0 if new_ids else self._stalls + 1
+        if self._stalls >= self.stall_limit:
+            return "no new tweets"
+        if self.cutoff and new_ids and all(snowflake_time(i) < self.cutoff for i in new_ids):
+            return "past since cutoff"
+        # X ranks replies rather than sorting them by time, so the first
+        # page being all stored replies says nothing about what is below;
+        # only scrolls count, and only several in a row
+        if self.known_ids and self.steps:
+            if new_ids and all(i in self.known_ids for i in new_ids):
+                self._known += 1
+            else:
+                self._known = 0
+            if self._known >= self.known_steps:
+                return "reached known replies"
+        if self.steps >= self.max_steps:
+            return "budget"
+        if self.deadline and time.monotonic() >= self.deadline:
+            return "time budget"
+        self.steps += 1
+        return None
+
+
+class _Collected:
+    """Dedups raw tweets across steps and applies the keep filter."""
+
+    def __init__(self, skip_id: str | None = None, keep=None):
+        self.skip_id = skip_id
+        self.keep = keep
+        self.seen_ids: set[str] = set()
+        self.tweets: list[dict] = []
+
+    def add(self, batch: list[dict]) -> list[str]:
+        """Take a batch; returns the IDs not seen before (kept or not)."""
+        new_ids = []
+        for t in batch:
+            if t["id"] == self.skip_id or t["id"] in self.seen_ids:
+                continue
+            self.seen_ids.add(t["id"])
+            new_ids.append(t["id"])
+            # rejected: already filtered out in the page
+            if t.get("rejected") or (self.keep and not self.keep(t["text"], t["handle"])):
+                continue
+            self.tweets.append(t)
+        return new_ids
+
+
+async def _collect_tweets(
+    page, url: str, operation: str, initial_wait: int,
+    rules: _StopRules, collected: _Collected,
+    mode: str = "graphql", scroll_wait: int = 2000, pace=None,
+) -> str:
+    """Load ``url`` and scroll it into ``collected`` until ``rules`` say
+    stop, or the page bottom stops growing. Returns the stop reason.
+
+    In ``graphql`` mode tweets are parsed from the page's ``operation``
+    responses; until the first such response arrives (or if it never
+    does) the rendered DOM is read instead. ``pace``, if given, is
+    awaited before the navigation and before every scroll, since each
+    one makes the page call X's API.
+    """
+    async def _read() -> list[dict]:
+        if capture.payloads:
+            return await capture.drain()
+        return await _extract_dom(page, collected.seen_ids, collected.skip_id, collected.keep)
+
+    focal_id = collected.skip_id if operation == TWEET_DETAIL else None
+    capture = _GraphQLCapture(page, (operation,), focal_id)
+    if mode == "graphql":
+        capture.attach()
+    try:
+        if pace:
+            await pace()
+        await page.goto(url, wait_until="domcontentloaded")
+        if any(part in page.url for part in _LOGIN_WALL_PARTS):
+            raise SessionBlocked(f"redirected to login wall: {page.url}")
+        await page.wait_for_timeout(initial_wait)
+
+        at_end = False
+        while True:
+            new_ids = collected.add(await _read())
+            if at_end:
+                stop = "end of page"
+                break
+            stop = rules.check(new_ids)
+            if stop:
+                break
+            if pace:
+                try:
+                    await pace()
+                except PastDeadline:
+                    stop = "time budget"
+                    break
+            at_end = not await _scroll(page, scroll_wait)
+
+        if capture.payloads:
+            collected.add(await capture.drain())
+        elif mode == "graphql":
+            log.info("No %s payloads seen for %s, used DOM extraction", operation, url)
+        log.info("  %s: %d scrolls, stopped (%s)", url, rules.steps, stop)
     finally:
-        await page.close()
+        capture.detach()
 
-    return results
+    return stop
+
+
+def _search_rows(
+    tweets: list[dict], query: str, since: datetime, queries: list[str] | None = None,
+) -> list[dict]:
+    """Rows for search results. When ``query`` is a planned combination,
+    ``queries`` are the originals it stands for and each row records the
+    one it matched."""
+    attribute = attributor(queries or [query])
+    collected_at = datetime.now(timezone.utc).isoformat()
+    rows = []
+    for t in tweets:
+        matched = attribute(t["text"])
+        encoded = _search_url(matched, since)[1]
+        rows.append({
+            "tweet_id": t["id"],
+            "author_name": t["name"],
+            "author_handle": t["handle"],
+            "text": t["text"],
+            "tweet_url": f"https://x.com/{t['handle']}/status/{t['id']}",
+            "source_type": "keyword_mention",
+            "source_detail": matched,
+            "parent_text": matched,
+            "parent_url": f"https://x.com/search?q={encoded}&f=latest",
+            "likes": t["likes"],
+            "retweets": t["retweets"],
+            "replies": t["replies"],
+            "tweet_created_at": t["created_at"],
+            "collected_at": collected_at,
+        })
+    return rows
+
+
+def _reply_rows(
+    tweets: list[dict], parent_tweet_id: str, parent_handle: str, parent_text: str,
+) -> list[dict]:
+    collected_at = datetime.now(timezone.utc).isoformat()
+    return [
+        {
+            "tweet_id": t["id"],
+            "author_name": t["name"],
+            "author_handle": t["handle"],
+            "text": t["text"],
+            "tweet_url": f"https://x.com/{t['handle']}/status/{t['id']}",
+            "source_type": "reply",
+            "source_detail": f"@{parent_handle}/{parent_tweet_id}",
+            "parent_text": parent_text,
+            "parent_url": f"https://x.com/{parent_handle}/status/{parent_tweet_id}",
+            "likes": t["likes"],
+            "retweets": t["retweets"],
+            "replies": t["replies"],
+            "tweet_created_at": t["created_at"],
+            "collected_at": collected_at,
+        }
+        for t in tweets
+    ]
+
+
+async def search_keyword_tweets(
+    page, query: str, relevance: RelevanceFilter,
+    since: datetime, max_scrolls: int = 15, mode: str = "graphql",
+    stall_limit: int = 2, scroll_wait: int = 2000,
+    deadline: float | None = None, stats: dict | None = None, pace=None,
+    queries: list[str] | None = None,
+) -> list[dict]:
+    """Search X for a query and collect matching tweets, with relevance filtering.
+
+    Results are latest-first, so scrolling stops once it reaches tweets
+    older than ``since``. If ``stats`` is given it receives the scroll
+    count and stop reason. ``queries`` are the original queries a
+    planned ``query`` combines (see ``query_plan``).
+    """
+    rules = _StopRules(max_scrolls, stall_limit, cutoff=since, deadline=deadline)
+    collected = _Collected(keep=relevance)
+    stop = await _collect_tweets(
+        page, _search_url(query, since)[0], SEARCH_TIMELINE, 4000, rules, collected,
+        mode=mode, scroll_wait=scroll_wait, pace=pace,
+    )
+    if stats is not None:
+        stats.update(scrolls=rules.steps, stop=stop)
+    return _search_rows(collected.tweets, query, since, queries)
 
 
 async def scrape_replies(
-    context, parent_tweet_id: str, parent_handle: str,
-    parent_text: str = "", max_scrolls: int = 5,
+    page, parent_tweet_id: str, parent_handle: str,
+    parent_text: str = "", max_scrolls: int = 20, mode: str = "graphql",
+    stall_limit: int = 2, scroll_wait: int = 2000, known_ids: set[str] | None = None,
+    deadline: float | None = None, stats: dict | None = None, pace=None,
 ) -> list[dict]:
-    """Open a tweet and scrape all replies."""
-    replies = []
-    seen_ids = set()
+    """Open a tweet in ``page`` and scrape all replies.
 
-    page = await context.new_page()
-    try:
-        url = f"https://x.com/{parent_handle}/status/{parent_tweet_id}"
-        await page.goto(url, wait_until="domcontentloaded")
-        await page.wait_for_timeout(3000)
+    ``known_ids`` are the replies stored by earlier runs; scrolling
+    stops once a few scrolls in a row turn up nothing else.
+    """
+    rules = _StopRules(max_scrolls, stall_limit, known_ids=known_ids, deadline=deadline)
+    collected = _Collected(skip_id=parent_tweet_id)
+    url = f"https://x.com/{parent_handle}/status/{parent_tweet_id}"
+    stop = await _collect_tweets(
+        page, url, TWEET_DETAIL, 3000, rules, collected,
+        mode=mode, scroll_wait=scroll_wait, pace=pace,
+    )
+    if stats is not None:
+        stats.update(scrolls=rules.steps, stop=stop)
+    return _reply_rows(collected.tweets, parent_tweet_id, parent_handle, parent_text)
+
+
+# ── Step 2b: the same targets through twikit's API ──────────────────
+
+def _from_twikit(tweet) -> dict:
+    """Convert a twikit Tweet to the raw tweet dict the scrapers produce."""
+    user = tweet.user
+    handle = user.screen_name if user else ""
+    return {
+        "id": str(tweet.id),
+        "handle": handle,
+        "name": (user.name if user else "") or handle,
+        "text": getattr(tweet, "full_text", None) or tweet.text or "",
+        "created_at": to_iso(tweet.created_at or ""),
+        "likes": tweet.favorite_count or 0,
+        "retweets": tweet.retweet_count or 0,
+        "replies": tweet.reply_count or 0,
+    }
+
+
+async def _page_api(result, rules: _StopRules, collected: _Collected, pace=None) -> str:
+    """Follow a twikit Result's cursor into ``collected`` until ``rules`` say stop."""
+    while True:
+        if not result:
+            return "end of results"
+        stop = rules.check(collected.add([_from_twikit(t) for t in result]))
+        if stop:
+            return stop
+        if not result.next_cursor:
+            return "end of results"
+        if pace:
+            try:
+                await pace()
+            except PastDeadline:
+                return "time budget"
+        result = await result.next()
+
+
+async def api_search_tweets(
+    client, query: str, relevance: RelevanceFilter,
+    since: datetime, max_pages: int = 15, stall_limit: int = 2,
+    deadline: float | None = None, stats: dict | None = None, pace=None,
+    queries: list[str] | None = None,
+) -> list[dict]:
+    """twikit counterpart of ``search_keyword_tweets``; same output rows."""
+    since_str = since.strftime("%Y-%m-%d")
+    until_str = (datetime.now(timezone.utc) + timedelta(days=1)).strftime("%Y-%m-%d")
+    rules = _StopRules(max_pages, stall_limit, cutoff=since, deadline=deadline)
+    collected = _Collected(keep=relevance)
 
-        for _ in range(max_scrolls):
-            articles = await page.query_selector_all('article[data-testid="tweet"]')
+    if pace:
+        await pace()
+    result = await client.search_tweet(
+        f"{query} since:{since_str} until:{until_str}", "Latest", count=20,
+    )
+    stop = await _page_api(result, rules, collected, pace)
+    if stats is not None:
+        stats.update(scrolls=rules.steps, stop=stop)
+    return _search_rows(collected.tweets, query, since, queries)
 
-            for article in articles:
-                try:
-                    link_el = await article.query_selector('a[href*="/status/"]')
-                    if not link_el:
-                        continue
-                    href = await link_el.get_attribute("href") or ""
-                    match = _TWEET_LINK_RE.search(href)
-                    if not match:
-                        continue
-
-                    username = match.group(1)
-                    tweet_id = match.group(2)
-
-                    # skip the parent tweet itself
-                    if tweet_id == parent_tweet_id:
-                        continue
-                    if tweet_id in seen_ids:
-                        continue
-                    seen_ids.add(tweet_id)
-
-                    text_el = await article.query_selector('[data-testid="tweetText"]')
-                    text = await text_el.inner_text() if text_el else ""
-
-                    name_el = await article.query_selector(
-                        '[data-testid="User-Name"] span'
+
+async def api_fetch_replies(
+    client, parent_tweet_id: str, parent_handle: str,
+    parent_text: str = "", max_pages: int = 20, stall_limit: int = 2,
+    known_ids: set[str] | None = None,
+    deadline: float | None = None, stats: dict | None = None, pace=None,
+) -> list[dict]:
+    """twikit counterpart of ``scrape_replies``; same output rows."""
+    rules = _StopRules(max_pages, stall_limit, known_ids=known_ids, deadline=deadline)
+    collected = _Collected(skip_id=parent_tweet_id)
+
+    if pace:
+        await pace()
+    tweet = await client.get_tweet_by_id(parent_tweet_id)
+    stop = await _page_api(tweet.replies, rules, collected, pace)
+    if stats is not None:
+        stats.update(scrolls=rules.steps, stop=stop)
+    return _reply_rows(collected.tweets, parent_tweet_id, parent_handle, parent_text)
+
+
+# ── account pool ─────────────────────────────────────────────────────
+
+def _endpoint_class(url: str) -> str | None:
+    """The rate-limit class of an X API request, or None for other traffic."""
+    if is_graphql_url(url, (TWEET_DETAIL,)):
+        return "tweet_detail"
+    if is_graphql_url(url, (SEARCH_TIMELINE,)):
+        return "search"
+    if is_graphql_url(url, ("UserTweets",)):
+        return "timeline_api"
+    return None
+
+
+# errors that mean X is refusing this account, not that the target is bad
+_BLOCKED_ERRORS = (SessionBlocked, TooManyRequests, Unauthorized, AccountLocked, AccountSuspended)
+
+
+class _Account:
+    """One logged-in X session: a twikit client and, once a target needs
+    the browser, its own browser context. Counts requests and errors."""
+
+    def __init__(self, cookies_path: str, scheduler: RequestScheduler, cooldown: float = 900):
+        self.name = os.path.splitext(os.path.basename(cookies_path))[0]
+        self.cookies_path = cookies_path
+        self.client = _twikit_client(cookies_path)
+        self.scheduler = scheduler
+        self.context = None
+        self.cooldown = cooldown
+        self.cooldown_until = 0.0
+        self.cooldowns = 0
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0  # targets acquired and not yet released
+
+    def available(self) -> bool:
+        return time.monotonic() >= self.cooldown_until
+
+    def cool_down(self, reason: str):
+        if self.available():
+            self.cooldowns += 1
+            log.warning("Account %s cooling down for %ds: %s", self.name, self.cooldown, reason)
+        self.cooldown_until = time.monotonic() + self.cooldown
+
+    def pacer(self, endpoint: str, deadline: float | None = None):
+        """Async callable that waits for this account's turn on ``endpoint``,
+        raising PastDeadline if that turn comes after ``deadline``."""
+        return functools.partial(self.scheduler.acquire, self.name, endpoint, deadline)
+
+    def rate_limited(self, endpoint: str, error: Exception | None = None):
+        reset_at = getattr(error, "rate_limit_reset", None)
+        self.scheduler.backoff(self.name, endpoint, reset_at=reset_at)
+
+    def watch(self, context):
+        """Feed X's rate-limit headers on this account's browser traffic to
+        the scheduler, and cool down on a 429."""
+        def _on_response(response):
+            endpoint = _endpoint_class(response.url)
+            if endpoint is None:
+                return
+            if response.status == 429:
+                self.rate_limited(endpoint)
+                self.cool_down(f"HTTP 429 from {urlparse(response.url).path}")
+            else:
+                self.scheduler.observe(self.name, endpoint, response.headers)
+        context.on("response", _on_response)
+
+
+class _AccountPool:
+    """Spreads targets over the accounts that are not cooling down."""
+
+    def __init__(self, accounts: list[_Account]):
+        self.accounts = accounts
+
+    def __len__(self):
+        return len(self.accounts)
+
+    def acquire(self) -> _Account | None:
+        """The least-busy available account, or None if all are cooling down.
+
+        Busy means targets in flight first, past requests second: request
+        counts only move once a target finishes, so workers starting
+        together would otherwise all land on the same account. Pair each
+        acquire with a ``release``.
+        """
+        ready = [a for a in self.accounts if a.available()]
+        if not ready:
+            return None
+        account = min(ready, key=lambda a: (a.in_flight, a.requests))
+        account.in_flight += 1
+        return account
+
+    def release(self, account: _Account):
+        account.in_flight -= 1
+
+    def summary(self) -> str:
+        return "Accounts: " + "; ".join(
+            f"{a.name} {a.requests} requests, {a.errors} errors, {a.cooldowns} cooldowns"
+            for a in self.accounts
+        )
+
+
+def cookie_paths(config: dict) -> list[str]:
+    """Cookie jars from twitter.cookies_files, else the single cookies_file."""
+    twitter = config["twitter"]
+    files = twitter.get("cookies_files") or [twitter.get("cookies_file", "data/cookies.json")]
+    paths = []
+    for f in files:
+        path = os.path.join(BASE_DIR, f)
+        if os.path.exists(path):
+            paths.append(path)
+        else:
+            log.warning("Cookie jar %s not found, skipping", path)
+    return paths
+
+
+# ── Step 3: fan targets out over a pool of pages ────────────────────
+
+_DEFAULT_SCROLL_BUDGET = {"timeline": 20, "thread": 40, "search": 15}
+
+# backends tried in order for each collector.reply_source setting
+_REPLY_SOURCES = {
+    "auto": ("twikit", "playwright"),
+    "twikit": ("twikit",),
+    "playwright": ("playwright",),
+}
+
+
+def _plan_targets(
+    parent_tweets: list[dict], indus_threads: list[dict],
+    search_groups: list[dict], since: datetime,
+    scroll_budget: dict | None = None, thread_states: dict | None = None,
+) -> list[dict]:
+    """Flatten timeline tweets, pinned threads and planned searches (from
+    ``query_plan.plan_queries``) into one ordered target list. Result
+    order follows this list, not completion order.
+
+    ``thread_states`` (from ``db.get_thread_states``) gives reply targets
+    the newest reply ID already collected; a target that has one was
+    read before, and stops scrolling once it only finds stored replies.
+    A combined search gets the scroll budget of each query it ORs together.
+    """
+    budget = {**_DEFAULT_SCROLL_BUDGET, **(scroll_budget or {})}
+    thread_states = thread_states or {}
+    targets = []
+    for pt in parent_tweets:
+        targets.append({
+            "kind": "timeline",
+            "key": f"tweet:{pt['tweet_id']}",
+            "label": f"Timeline: {pt['text_preview'][:60]}…",
+            "url": f"https://x.com/{pt['handle']}/status/{pt['tweet_id']}",
+            "tweet_id": pt["tweet_id"],
+            "handle": pt["handle"],
+            "parent_text": pt["text_preview"],
+            "source_type": "timeline_reply",
+            "max_scrolls": budget["timeline"],
+            "reply_count": pt["reply_count"],
+            "known_upto": thread_states.get(pt["tweet_id"], {}).get("newest_reply_id"),
+        })
+    for thread in indus_threads:
+        label = thread.get("label", thread["tweet_id"])
+        targets.append({
+            "kind": "thread",
+            "key": f"tweet:{thread['tweet_id']}",
+            "label": f"Thread: {label}…",
+            "url": f"https://x.com/{thread['handle']}/status/{thread['tweet_id']}",
+            "tweet_id": thread["tweet_id"],
+            "handle": thread["handle"],
+            "parent_text": label,
+            "source_type": "thread_reply",
+            "max_scrolls": thread.get("max_scrolls", budget["thread"]),
+            "reply_count": None,
+            "known_upto": thread_states.get(thread["tweet_id"], {}).get("newest_reply_id"),
+        })
+    for group in search_groups:
+        q = group["query"]
+        targets.append({
+            "kind": "search",
+            "key": f"search:{q}",
+            "label": f"Search: {q}",
+            "url": _search_url(q, since)[0],
+            "query": q,
+            "queries": group["queries"],
+            "max_scrolls": budget["search"] * len(group["direct"]),
+        })
+    return targets
+
+
+async def _scrape_target(
+    get_page, target: dict, relevance: RelevanceFilter, since: datetime, collector_cfg: dict,
+    account: _Account | None = None, deadline: float | None = None,
+    timings: dict | None = None,
+) -> list[dict]:
+    """Scrape one planned target, trying each configured reply source in
+    turn and falling back to the next one if it raises.
+
+    ``get_page`` is awaited only when the Playwright backend is used.
+    Records the backend, scroll (or API page) count and stop reason on
+    ``target``; per-backend counts and seconds go into ``timings``, and
+    requests and errors are counted against ``account``, which is put
+    into cooldown if X refuses it. A refusal is raised straight away,
+    without trying the next backend, so the caller can retry the target
+    on another account.
+    """
+    client = account.client if account else None
+    backends = _REPLY_SOURCES[collector_cfg.get("reply_source", "auto")]
+    if client is None:
+        backends = tuple(b for b in backends if b != "twikit") or ("playwright",)
+    stall_limit = collector_cfg.get("stall_scrolls", 2)
+    search = target["kind"] == "search"
+    endpoint = "search" if search else "tweet_detail"
+    pace = account.pacer(endpoint, deadline) if account else None
+    known_ids = None
+    if not search and target["known_upto"]:
+        known_ids = await asyncio.to_thread(
+            get_reply_ids, f"@{target['handle']}/{target['tweet_id']}",
+        )
+
+    for n, backend in enumerate(backends):
+        stats: dict = {}
+        started = time.monotonic()
+        try:
+            if backend == "twikit":
+                if search:
+                    rows = await api_search_tweets(
+                        client, target["query"], relevance, since,
+                        max_pages=target["max_scrolls"], stall_limit=stall_limit,
+                        deadline=deadline, stats=stats, pace=pace, queries=target["queries"],
+                    )
+                else:
+                    rows = await api_fetch_replies(
+                        client, target["tweet_id"], target["handle"],
+                        parent_text=target["parent_text"], max_pages=target["max_scrolls"],
+                        stall_limit=stall_limit, known_ids=known_ids,
+                        deadline=deadline, stats=stats, pace=pace,
+                    )
+            else:
+                opts = {
+                    "max_scrolls": target["max_scrolls"],
+                    "mode": collector_cfg.get("extraction", "graphql"),
+                    "stall_limit": stall_limit,
+                    "scroll_wait": collector_cfg.get("scroll_wait_ms", 2000),
+                    "deadline": deadline,
+                    "stats": stats,
+                    "pace": pace,
+                }
+                page = await get_page()
+                if search:
+                    rows = await search_keyword_tweets(
+                        page, target["query"], relevance, since, queries=target["queries"], **opts,
+                    )
+                else:
+                    rows = await scrape_replies(
+                        page, target["tweet_id"], target["handle"],
+                        parent_text=target["parent_text"], known_ids=known_ids,
+                        **opts,
                     )
-                    display_name = await name_el.inner_text() if name_el else username
-
-                    time_el = await article.query_selector("time")
-                    created_at = ""
-                    if time_el:
-                        created_at = await time_el.get_attribute("datetime") or ""
-
-                    replies.append({
-                        "tweet_id": tweet_id,
-                        "author_name": display_name,
-                        "author_handle": username,
-                        "text": text,
-                        "tweet_url": f"https://x.com/{username}/status/{tweet_id}",
-                        "source_type": "reply",
-                        "source_detail": f"@{parent_handle}/{parent_tweet_id}",
-                        "parent_text": parent_text,
-                        "parent_url": f"https://x.com/{parent_handle}/status/{parent_tweet_id}",
-                        "likes": 0,
-                        "retweets": 0,
-                        "replies": 0,
-                        "tweet_created_at": created_at,
-                        "collected_at": datetime.now(timezone.utc).isoformat(),
-                    })
-                except Exception:
+        except PastDeadline as e:
+            # the budget ran out before the first request could be made
+            log.info("  %s: not started, %s", target["url"], e)
+            rows = []
+            stats["stop"] = "time budget"
+        except Exception as e:
+            if timings is not None:
+                _record_timing(timings, backend, time.monotonic() - started, failed=True)
+            if account:
+                account.requests += stats.get("scrolls", 0) + 1
+                account.errors += 1
+                if isinstance(e, TooManyRequests):
+                    account.rate_limited(endpoint, e)
+                if isinstance(e, _BLOCKED_ERRORS):
+                    account.cool_down(f"{type(e).__name__}: {e}")
+            # a refused account is cooling down; the next backend would
+            # only wait that out, so hand the target to another account
+            if isinstance(e, _BLOCKED_ERRORS) or n == len(backends) - 1:
+                raise
+            log.info("  %s failed for %s (%s), trying %s", backend, target["url"], e, backends[n + 1])
+            continue
+
+        if timings is not None:
+            _record_timing(timings, backend, time.monotonic() - started)
+        if account:
+            account.requests += stats.get("scrolls", 0) + 1
+        if not search:
+            for r in rows:
+                r["source_type"] = target["source_type"]
+        target["backend"] = backend
+        target["scrolls"] = stats.get("scrolls", 0)
+        target["stop"] = stats.get("stop")
+        return rows
+
+
+def _record_timing(timings: dict, backend: str, seconds: float, failed: bool = False):
+    t = timings.setdefault(backend, {"targets": 0, "failures": 0, "seconds": 0.0})
+    t["failures" if failed else "targets"] += 1
+    t["seconds"] += seconds
+
+
+def _timing_summary(timings: dict) -> str:
+    parts = [
+        f"{name} {t['targets']} ok / {t['failures']} failed in {t['seconds']:.1f}s"
+        for name, t in timings.items()
+    ]
+    return "Backends: " + ("; ".join(parts) if parts else "none used")
+
+
+def _prioritize(targets: list[dict], yields: dict[str, float]) -> list[dict]:
+    """Order targets by historical new rows per scroll, best first.
+
+    Targets with no history take the average of their kind, or go first
+    when the kind has no history at all, so new targets get tried.
+    """
+    by_kind: dict[str, list[float]] = {}
+    for t in targets:
+        if t["key"] in yields:
+            by_kind.setdefault(t["kind"], []).append(yields[t["key"]])
+
+    def score(t: dict) -> float:
+        if t["key"] in yields:
+            return yields[t["key"]]
+        known = by_kind.get(t["kind"])
+        return sum(known) / len(known) if known else float("inf")
+
+    return sorted(targets, key=score, reverse=True)
+
+
+class _LazyBrowser:
+    """Opens the browser (warm daemon or cold launch) on first use only,
+    so runs served entirely by the API never start Chromium. The first
+    account uses the daemon's (or launched) context; every other account
+    gets its own context in the same browser."""
+
+    def __init__(self, pw, collector_cfg: dict, primary: _Account):
+        self._pw = pw
+        self._cfg = collector_cfg
+        self._primary = primary
+        self._lock = asyncio.Lock()
+        self.browser = None
+        self.stats: _NetStats | None = None
+
+    async def new_page(self, account: _Account):
+        async with self._lock:
+            if self.browser is None:
+                self.browser, context, self.stats = await _open_browser(
+                    self._pw, self._primary.cookies_path, self._cfg,
+                )
+                self._primary.context = context
+                self._primary.watch(context)
+            if account.context is None:
+                account.context = await _new_context(
+                    self.browser, account.cookies_path, self._cfg, self.stats,
+                )
+                account.watch(account.context)
+        return await account.context.new_page()
+
+    async def close(self):
+        if self.browser is not None:
+            await self.browser.close()
+
+
+async def _run_targets(
+    browser: _LazyBrowser, accounts: _AccountPool, targets: list[dict], scrape, progress,
+    on_rows, concurrency: int = 4, per_host_limit: int = 4,
+    deadline: float | None = None,
+):
+    """Scrape ``targets`` with ``concurrency`` workers sharing one browser.
+
+    Each target runs on the least-used account that is not cooling down;
+    a target refused by X is retried on another account. Workers keep
+    one page per account, opened the first time ``scrape`` asks for it,
+    and pull the next target off a shared queue; at most
+    ``per_host_limit`` targets load from the same host at once.
+    Each finished target's rows are handed to ``await on_rows(target,
+    rows)`` as soon as it is done; a target that raised gets an ``error``
+    key instead. Once ``deadline`` passes, or every account is cooling
+    down, no new target starts; the rest are marked ``skipped`` with the
+    reason.
+    """
+    total = len(targets)
+    queue: asyncio.Queue = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(i)
+    host_limits: dict[str, asyncio.Semaphore] = {}
+
+    async def worker():
+        pages: dict[str, object] = {}
+
+        def page_getter(account: _Account):
+            async def get_page():
+                page = pages.get(account.name)
+                if page is None or page.is_closed():
+                    page = pages[account.name] = await browser.new_page(account)
+                return page
+            return get_page
+
+        try:
+            while True:
+                try:
+                    i = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                target = targets[i]
+                if deadline and time.monotonic() >= deadline:
+                    target["skipped"] = "time budget"
                     continue
+                account = accounts.acquire()
+                if account is None:
+                    target["skipped"] = "all accounts cooling down"
+                    continue
+                host = urlparse(target["url"]).hostname or ""
+                limit = host_limits.setdefault(host, asyncio.Semaphore(per_host_limit))
+
+                progress(f"[{i + 1}/{total}] {target['label']}")
+                rows = []
+                async with limit:
+                    try:
+                        rows = await scrape(page_getter(account), target, account)
+                    except _BLOCKED_ERRORS as e:
+                        target["attempts"] = target.get("attempts", 0) + 1
+                        if target["attempts"] < len(accounts):
+                            progress(f"  [{i + 1}/{total}] refused for {account.name}, retrying")
+                            queue.put_nowait(i)
+                            continue
+                        log.warning("Target %s failed: %s", target["url"], e)
+                        target["error"] = str(e)
+                    except Exception as e:
+                        log.warning("Target %s failed: %s", target["url"], e)
+                        target["error"] = str(e)
+                    finally:
+                        accounts.release(account)
+                unit = "tweets" if target["kind"] == "search" else "replies"
+                progress(f"  [{i + 1}/{total}] -> {len(rows)} {unit}")
+                if "error" not in target:
+                    await on_rows(target, rows)
+        finally:
+            for page in pages.values():
+                if not page.is_closed():
+                    await page.close()
+
+    workers = max(1, min(concurrency, total))
+    await asyncio.gather(*(worker() for _ in range(workers)))
+
+    skipped: dict[str, int] = {}
+    for t in targets:
+        if t.get("skipped"):
+            skipped[t["skipped"]] = skipped.get(t["skipped"], 0) + 1
+    for reason, n in skipped.items():
+        progress(f"Skipped {n} lowest-yield targets ({reason})")
+
+
+# ── storage ──────────────────────────────────────────────────────────
+
+def _finish_target(target: dict, rows: list[dict], run_id: int | None = None):
+    """Move a target's yield and high-water mark once its rows are stored,
+    and mark it done in the run journal."""
+    ids = [int(r["tweet_id"]) for r in rows]
+    if run_id is not None:
+        finish_run_target(run_id, target["position"], "done", target["new_rows"])
+    if target["kind"] == "search":
+        # yields are kept per original query so the planner can
+        # regroup them and spot idle ones next run
+        for q, n in target["new_by_query"].items():
+            record_target_yield(f"search:{q}", n, target["scrolls"])
+        return
+    record_target_yield(target["key"], target["new_rows"], target["scrolls"])
+    if target["known_upto"]:
+        ids.append(int(target["known_upto"]))
+    # a thread cut short by a budget may have unread replies; leave its
+    # reply count unset so the next run does not skip it as unchanged
+    partial = target["stop"] in ("budget", "time budget")
+    update_thread_state(
+        target["tweet_id"], None if partial else target["reply_count"],
+        str(max(ids)) if ids else None,
+    )
 
-            await page.evaluate("window.scrollBy(0, 2000)")
-            await page.wait_for_timeout(2000)
-    finally:
-        await page.close()
 
-    return replies
+class _TweetWriter:
+    """Single consumer that stores scraped rows while scraping goes on.
+
+    Workers ``put`` each finished target's rows on a bounded queue; the
+    writer drains whatever is waiting (up to ``batch_size`` rows),
+    classifies it into one transaction, then finishes those targets, so only new tweets are
+    kept in memory. Reports running new / duplicate counts. ``new_tweets``
+    follows plan order (target position, then row order), not completion
+    order.
+    """
+
+    def __init__(
+        self, progress, run_id: int | None = None,
+        batch_size: int = 200, queue_size: int = 8,
+    ):
+        self.progress = progress
+        self.run_id = run_id
+        self.batch_size = batch_size
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._new: list[tuple[int, int, dict]] = []
+        self.duplicates = 0
+        self._task = None
+
+    @property
+    def new_tweets(self) -> list[dict]:
+        return [td for *_, td in sorted(self._new, key=lambda e: e[:2])]
+
+    def start(self):
+        self._task = asyncio.create_task(self._drain())
+
+    async def put(self, target: dict, rows: list[dict]):
+        await self._put((target, rows))
+
+    async def close(self):
+        """Flush what is queued and wait for the writer to finish."""
+        if not self._task.done():
+            await self._put(None)
+        await self._task
+
+    async def _put(self, item):
+        # race the put against the writer: if it dies while the queue is
+        # full, nothing would ever make room
+        put = asyncio.ensure_future(self.queue.put(item))
+        try:
+            await asyncio.wait({put, self._task}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            put.cancel()
+        if not put.done() or put.cancelled():
+            self._task.result()  # re-raise the writer's error
+            raise RuntimeError("tweet writer has stopped")
+
+    async def _drain(self):
+        while True:
+            item = await self.queue.get()
+            if item is None:
+                return
+            batch = [item]
+            size = len(item[1])
+            closing = False
+            while size < self.batch_size:
+                try:
+                    item = self.queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if item is None:
+                    closing = True
+                    break
+                batch.append(item)
+                size += len(item[1])
+            await asyncio.to_thread(self._commit, batch)
+            if size:
+                self.progress(
+                    f"  saved: {len(self._new)} new, {self.duplicates} duplicates so far"
+                )
+            if closing:
+                return
+
+    def _commit(self, batch: list[tuple[dict, list[dict]]]):
+        rows = classify_rows([r for _, rows in batch for r in rows])
+        inserted = set(insert_tweets(rows))
+        for target, rows in batch:
+            target["new_rows"] = 0
+            if target["kind"] == "search":
+                target["new_by_query"] = dict.fromkeys(target["queries"], 0)
+            for i, td in enumerate(rows):
+                if td["tweet_id"] not in inserted:
+                    self.duplicates += 1
+                    continue
+                # a tweet found by two targets in one batch counts once
+                inserted.discard(td["tweet_id"])
+                self._new.append((target.get("position", 0), i, td))
+                target["new_rows"] += 1
+                if target["kind"] == "search":
+                    target["new_by_query"][td["source_detail"]] += 1
+        # yields and high-water marks move only after the rows behind
+        # them are stored
+        for target, rows in batch:
+            _finish_target(target, rows, self.run_id)
 
 
 # ── main pipeline ────────────────────────────────────────────────────
 
-async def run(since: datetime, progress_cb=None) -> list[dict]:
+async def _plan_run(
+    config: dict, accounts: _AccountPool, since: datetime, progress,
+) -> list[dict]:
+    """Fetch the timeline and build this run's prioritized target list."""
+    collector_cfg = config.get("collector", {})
+    handle = config.get("monitor", {}).get("sarvam_handle", "SarvamAI")
+
+    progress(f"Fetching @{handle} tweet list…")
+    lead = accounts.acquire()
+    try:
+        parent_tweets = await get_sarvam_tweet_ids(
+            lead.cookies_path, handle, since, client=lead.client,
+            pace=lead.pacer("timeline_api"),
+        )
+    finally:
+        accounts.release(lead)
+
+    progress(f"Found {len(parent_tweets)} tweets from @{handle}")
+
+    indus_threads = config.get("monitor", {}).get("indus_threads", [])
+    thread_states = get_thread_states(
+        [pt["tweet_id"] for pt in parent_tweets] + [t["tweet_id"] for t in indus_threads]
+    )
+
+    # a parent whose reply count hasn't moved since we last read it has
+    # nothing new for us
+    changed = [
+        pt for pt in parent_tweets
+        if thread_states.get(pt["tweet_id"], {}).get("reply_count") != pt["reply_count"]
+    ]
+    if len(changed) < len(parent_tweets):
+        progress(f"Skipping {len(parent_tweets) - len(changed)} tweets with no new replies")
+    parent_tweets = changed
+
+    search_cfg = config.get("search", {})
+    search_queries = search_cfg.get("queries", [])
+    plan_cfg = search_cfg.get("planner", {})
+    query_history = get_target_history([f"search:{q}" for q in search_queries])
+    search_groups, idle_queries = plan_queries(
+        search_queries, query_history,
+        max_length=plan_cfg.get("max_query_length", 450),
+        idle_runs=plan_cfg.get("idle_runs", 3),
+        retry_idle_days=plan_cfg.get("retry_idle_days", 7),
+    )
+    progress(
+        f"Search plan: {len(search_queries)} queries -> {len(search_groups)} searches"
+        + (f" ({len(idle_queries)} idle skipped)" if idle_queries else "")
+    )
+
+    targets = _plan_targets(
+        parent_tweets, indus_threads, search_groups, since,
+        scroll_budget=collector_cfg.get("scroll_budget"),
+        thread_states=thread_states,
+    )
+    yields = get_target_yields([t["key"] for t in targets if t["kind"] != "search"])
+    # a combined search is worth what the queries it covers are worth
+    for t in targets:
+        known = [
+            query_history[f"search:{q}"]["yield_per_scroll"]
+            for q in t.get("queries", []) if f"search:{q}" in query_history
+        ]
+        if known:
+            yields[t["key"]] = sum(known)
+    targets = _prioritize(targets, yields)
+    return targets
+
+
+def _pid_alive(pid: int | None) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def interrupted_run() -> dict | None:
+    """The last run, from ``db.get_last_run``, if it can be resumed.
+
+    That is a run that raised, had targets fail or run out of accounts,
+    or whose process died mid-run. Targets skipped by the time budget
+    count as settled.
+    """
+    last = get_last_run()
+    if last is None or last["done"] >= last["targets"]:
+        return None
+    if last["status"] in ("failed", "partial"):
+        return last
+    if last["status"] == "running" and not _pid_alive(last["pid"]):
+        return last
+    return None
+
+
+async def run(
+    since: datetime, progress_cb=None, time_budget: float | None = None,
+    resume: bool = False,
+) -> list[dict]:
     """Run the collection pipeline. Returns list of new tweets.
 
     Args:
         since: only collect tweets after this datetime
         progress_cb: optional callable(message: str) for live progress updates
+        time_budget: optional seconds for the whole run; targets are tried
+            in order of past yield and the rest skipped once it runs out
+        resume: continue the last interrupted run (with its ``since``)
+            from its first unfinished target instead of planning anew
     """
+    deadline = time.monotonic() + time_budget if time_budget else None
     config = load_config()
     init_db()
+    # rows stored by an older classifier are redone while we scrape
+    reclassify = asyncio.create_task(asyncio.to_thread(reclassify_stale))
 
     def _progress(msg: str):
         log.info(msg)
@@ -412,91 +1600,103 @@ async def run(since: datetime, progress_cb=None) -> list[dict]:
 
     _progress(f"Collecting feedback since: {since.strftime('%Y-%m-%d %H:%M UTC')}")
 
-    cookies_path = os.path.join(
-        BASE_DIR, config["twitter"].get("cookies_file", "data/cookies.json")
-    )
-    if not os.path.exists(cookies_path):
+    jars = cookie_paths(config)
+    if not jars:
         raise FileNotFoundError("No cookies found. Run login_helper.py first.")
 
-    handle = config.get("monitor", {}).get("sarvam_handle", "SarvamAI")
-
-    _progress(f"Fetching @{handle} tweet list…")
-    parent_tweets = await get_sarvam_tweet_ids(cookies_path, handle, since)
-
-    _progress(f"Found {len(parent_tweets)} tweets from @{handle}")
-
-    all_replies: list[dict] = []
-
-    indus_threads = config.get("monitor", {}).get("indus_threads", [])
-    search_queries = config.get("search", {}).get("queries", [])
-
-    async with async_playwright() as pw:
-        browser, context = await _create_browser_context(pw, cookies_path)
-        try:
-            # Part 1: SarvamAI timeline replies
-            total = len(parent_tweets) + len(indus_threads) + len(search_queries)
-            idx = 0
-            for pt in parent_tweets:
-                idx += 1
-                _progress(
-                    f"[{idx}/{total}] Timeline: {pt['text_preview'][:60]}…"
-                )
-                replies = await scrape_replies(
-                    context, pt["tweet_id"], pt["handle"],
-                    parent_text=pt["text_preview"], max_scrolls=5,
-                )
-                for r in replies:
-                    r["source_type"] = "timeline_reply"
-                _progress(f"  -> {len(replies)} replies")
-                all_replies.extend(replies)
-                await asyncio.sleep(2)
-
-            # Part 2: pinned Indus threads
-            for thread in indus_threads:
-                idx += 1
-                label = thread.get("label", thread["tweet_id"])
-                _progress(f"[{idx}/{total}] Thread: {label}…")
-                replies = await scrape_replies(
-                    context, thread["tweet_id"], thread["handle"],
-                    parent_text=label, max_scrolls=8,
+    collector_cfg = config.get("collector", {})
+    scheduler = RequestScheduler(collector_cfg.get("rate_limits"))
+    accounts = _AccountPool([
+        _Account(path, scheduler, cooldown=collector_cfg.get("account_cooldown", 900))
+        for path in jars
+    ])
+    if len(accounts) > 1:
+        _progress(f"Spreading collection over {len(accounts)} accounts")
+
+    search_cfg = config.get("search", {})
+    relevance = RelevanceFilter(
+        search_cfg.get("exclude_terms", []), search_cfg.get("relevance_signals", []),
+        whole_words=search_cfg.get("match_whole_words", False),
+    )
+    if resume:
+        resumed = interrupted_run()
+        if resumed is None:
+            _progress("No interrupted run to resume; starting a new one")
+    else:
+        resumed = None
+
+    if resumed:
+        run_id = resumed["run_id"]
+        since = datetime.fromisoformat(resumed["since"])
+        targets = get_run_targets(run_id, incomplete_only=True)
+        reopen_run(run_id, os.getpid())
+        _progress(
+            f"Resuming run {run_id} (since {since.strftime('%Y-%m-%d %H:%M UTC')}): "
+            f"{len(targets)} of {resumed['targets']} targets left"
+        )
+    else:
+        targets = await _plan_run(config, accounts, since, _progress)
+        run_id = start_run(since.isoformat(), targets, os.getpid())
+
+    timings: dict = {}
+
+    async def scrape(get_page, target, account):
+        return await _scrape_target(
+            get_page, target, relevance, since, collector_cfg,
+            account=account, deadline=deadline, timings=timings,
+        )
+
+    writer = _TweetWriter(_progress, run_id, batch_size=collector_cfg.get("write_batch", 200))
+    writer.start()
+    try:
+        async with async_playwright() as pw:
+            browser = _LazyBrowser(pw, collector_cfg, accounts.accounts[0])
+            try:
+                await _run_targets(
+                    browser, accounts, targets, scrape, _progress, writer.put,
+                    concurrency=collector_cfg.get("concurrency", 4),
+                    per_host_limit=collector_cfg.get("per_host_limit", 4),
+                    deadline=deadline,
                 )
-                for r in replies:
-                    r["source_type"] = "thread_reply"
-                _progress(f"  -> {len(replies)} replies")
-                all_replies.extend(replies)
-                await asyncio.sleep(2)
-
-            # Part 3: broader keyword search
-            search_cfg = config.get("search", {})
-            exclude_terms = search_cfg.get("exclude_terms", [])
-            relevance_signals = search_cfg.get("relevance_signals", [])
-
-            if search_queries:
-                _progress(f"Searching X for {len(search_queries)} keyword queries…")
-                for q in search_queries:
-                    idx += 1
-                    _progress(f"[{idx}/{total}] Search: {q}")
-                    kw_tweets = await search_keyword_tweets(
-                        context, q, exclude_terms, relevance_signals,
-                        since, max_scrolls=3,
-                    )
-                    _progress(f"  -> {len(kw_tweets)} tweets")
-                    all_replies.extend(kw_tweets)
-                    await asyncio.sleep(2)
-        finally:
-            await browser.close()
-
-    new_tweets: list[dict] = []
-    seen_ids: set[str] = set()
-    for td in all_replies:
-        tid = td["tweet_id"]
-        if tid in seen_ids:
+                _progress(_timing_summary(timings))
+                _progress(accounts.summary())
+                _progress(f"Rate limiting: waited {scheduler.waited:.1f}s in total")
+                if browser.stats:
+                    _progress(await browser.stats.summary())
+            finally:
+                try:
+                    await browser.close()
+                finally:
+                    await writer.close()
+    except BaseException:
+        finish_run(run_id, "failed")
+        raise
+
+    # targets left out by --time-budget were skipped on purpose and are
+    # not offered for --resume; errors and cooled-down accounts are
+    incomplete = 0
+    for target in targets:
+        if "error" in target:
+            status = "error"
+        elif target.get("skipped") == "time budget":
+            status = "budget"
+        elif target.get("skipped"):
+            status = "skipped"
+        else:
             continue
-        seen_ids.add(tid)
-        if insert_tweet(td):
-            new_tweets.append(td)
+        finish_run_target(run_id, target["position"], status)
+        incomplete += status != "budget"
+    finish_run(run_id, "partial" if incomplete else "done")
+    if incomplete:
+        _progress(f"{incomplete} targets unfinished; run with --resume to retry them")
+
+    try:
+        await reclassify
+    except Exception as e:
+        log.warning("Background reclassification failed: %s", e)
 
-    _progress(f"Done! {len(new_tweets)} new replies collected.")
+    new_tweets = writer.new_tweets
+    _progress(f"Done! {len(new_tweets)} new replies collected ({writer.duplicates} duplicates skipped).")
 
     notif_cfg = config.get("notification", {})
     if notif_cfg.get("email", {}).get("enabled"):
@@ -513,9 +1713,12 @@ async def run(since: datetime, progress_cb=None) -> list[dict]:
     return new_tweets
 
 
-def collect_feedback(since: datetime, progress_cb=None) -> list[dict]:
+def collect_feedback(
+    since: datetime, progress_cb=None, time_budget: float | None = None,
+    resume: bool = False,
+) -> list[dict]:
     """Sync wrapper for the async run() — safe to call from Streamlit."""
-    return asyncio.run(run(since, progress_cb=progress_cb))
+    return asyncio.run(run(since, progress_cb=progress_cb, time_budget=time_budget, resume=resume))
 
 
 def main():
@@ -528,6 +1731,8 @@ examples:
   python collector.py --since "2026-02-25"       # from Feb 25
   python collector.py --since 7d                 # last 7 days
   python collector.py --since 2w                 # last 2 weeks
+  python collector.py --time-budget 2m           # best targets first, 2 min max
+  python collector.py --resume                   # finish an interrupted run
 """,
     )
     parser.add_argument(
@@ -538,9 +1743,22 @@ examples:
              'Accepts: "2026-02-25", "2026-02-25 14:00", "3d", "12h", "2w". '
              "Defaults to last 24 hours.",
     )
+    parser.add_argument(
+        "--time-budget",
+        type=str,
+        default=None,
+        help='Stop starting new targets after this long, most productive first. '
+             'Accepts: "90", "90s", "5m", "1h". Defaults to no limit.',
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue the last interrupted run from its first unfinished target "
+             "(uses that run's --since).",
+    )
     args = parser.parse_args()
     since = parse_since(args.since)
-    asyncio.run(run(since))
+    asyncio.run(run(since, time_budget=parse_duration(args.time_budget), resume=args.resume))
 
 
 if __name__ == "__main__":
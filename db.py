@@ -1,19 +1,134 @@
+"""
+Feedback storage
+~~~~~~~~~~~~~~~~
+SQLite database at ``data/feedback.db``: collected tweets plus the
+collector's bookkeeping (thread high-water marks, target yields and the
+run journal).
+
+Benchmark:         python db.py --bench [N]
+Index check:       python db.py --check-plans
+"""
+
+import argparse
+import atexit
+import json
 import os
+import queue
 import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime, timezone
 
+from timeutil import created_ms
+
 DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "feedback.db")
 
 
-def _connect():
-    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+# ── connections ──────────────────────────────────────────────────────
+# One long-lived writer connection (writes are serialized behind a lock)
+# and a small pool of read-only connections, shared by every thread in
+# the process: the collector's writer thread and the dashboard's script
+# threads. The database runs in WAL mode, so a collector run in another
+# process (cron) no longer blocks dashboard reads, and vice versa.
+
+READ_POOL_SIZE = 4
+
+_PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",   # durable enough under WAL, far fewer fsyncs
+    "PRAGMA cache_size = -16000",    # 16 MB page cache per connection
+    "PRAGMA mmap_size = 268435456",  # read pages through a 256 MB memory map
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA busy_timeout = 5000",    # wait for a lock rather than fail at once
+)
+
+
+class _Pool:
+    def __init__(self, path: str, readers: int):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._open_conns: list[sqlite3.Connection] = []
+        self._writer = self._open()
+        self._writer.execute("PRAGMA journal_mode = WAL")
+        self._write_lock = threading.Lock()
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._readers = threading.BoundedSemaphore(readers)
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for pragma in _PRAGMAS:
+            conn.execute(pragma)
+        self._open_conns.append(conn)
+        return conn
+
+    @contextmanager
+    def write(self):
+        """The writer connection, inside one transaction."""
+        with self._write_lock, self._writer:
+            yield self._writer
+
+    @contextmanager
+    def read(self):
+        """A read-only connection from the pool."""
+        with self._readers:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._open()
+                conn.execute("PRAGMA query_only = ON")
+            try:
+                yield conn
+            finally:
+                self._idle.put(conn)
+
+    def close(self):
+        # refresh planner statistics if the data has shifted enough
+        self._writer.execute("PRAGMA optimize")
+        for conn in self._open_conns:
+            conn.close()
+        self._open_conns.clear()
+
+
+_pools: dict[tuple[str, int], _Pool] = {}
+_pools_lock = threading.Lock()
+
+
+def _pool() -> _Pool:
+    # keyed by pid too: a forked child must not share its parent's handles
+    key = (DB_PATH, os.getpid())
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = _Pool(DB_PATH, READ_POOL_SIZE)
+        return _pools[key]
+
+
+def _reading():
+    return _pool().read()
+
+
+def _writing():
+    return _pool().write()
+
+
+@atexit.register
+def close_connections():
+    """Close this process's pooled connections (the next call reopens
+    them). Pools a forked child inherited belong to its parent and are
+    left alone."""
+    pid = os.getpid()
+    with _pools_lock:
+        for key in [k for k in _pools if k[1] == pid]:
+            _pools.pop(key).close()
 
 
 def init_db():
-    conn = _connect()
+    with _writing() as conn:
+        _create_schema(conn)
+
+
+def _create_schema(conn):
     conn.execute("""
         CREATE TABLE IF NOT EXISTS tweets (
             tweet_id       TEXT PRIMARY KEY,
@@ -29,74 +144,626 @@ def init_db():
             retweets       INTEGER DEFAULT 0,
             replies        INTEGER DEFAULT 0,
             tweet_created_at TEXT,
-            collected_at   TEXT
+            created_ms     INTEGER,
+            collected_at   TEXT,
+            bucket         TEXT,
+            bucket_scores  TEXT,
+            classifier_version INTEGER
         )
     """)
-    for col, default in [
-        ("parent_text", "''"),
-        ("parent_url", "''"),
+    for col, decl in [
+        ("parent_text", "TEXT DEFAULT ''"),
+        ("parent_url", "TEXT DEFAULT ''"),
+        ("bucket", "TEXT"),
+        ("bucket_scores", "TEXT"),  # JSON: {bucket: signal count}
+        ("classifier_version", "INTEGER"),
+        ("created_ms", "INTEGER"),  # tweet_created_at as UTC epoch ms
     ]:
         try:
-            conn.execute(f"ALTER TABLE tweets ADD COLUMN {col} TEXT DEFAULT {default}")
+            conn.execute(f"ALTER TABLE tweets ADD COLUMN {col} {decl}")
         except sqlite3.OperationalError:
             pass
-    conn.commit()
+    _backfill_created_ms(conn)
+    _ensure_indexes(conn)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS thread_state (
+            tweet_id         TEXT PRIMARY KEY,
+            reply_count      INTEGER,
+            newest_reply_id  TEXT,
+            last_scraped_at  TEXT
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS target_yield (
+            target_key        TEXT PRIMARY KEY,
+            runs              INTEGER DEFAULT 0,
+            yield_per_scroll  REAL DEFAULT 0,
+            last_new_rows     INTEGER DEFAULT 0,
+            last_run_at       TEXT
+        )
+    """)
+    # run journal: what each collection run planned and which targets
+    # finished, so an interrupted run can be resumed; resume works per
+    # target (an unfinished one is read again from the top)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS runs (
+            run_id       INTEGER PRIMARY KEY AUTOINCREMENT,
+            since        TEXT,
+            status       TEXT,
+            pid          INTEGER,
+            started_at   TEXT,
+            finished_at  TEXT
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS run_targets (
+            run_id     INTEGER,
+            position   INTEGER,
+            target     TEXT,
+            status     TEXT DEFAULT 'pending',
+            new_rows   INTEGER DEFAULT 0,
+            updated_at TEXT,
+            PRIMARY KEY (run_id, position)
+        )
+    """)
+
+
+# ── indexes ──────────────────────────────────────────────────────────
+# One per dashboard access path: the time window (newest first), the
+# window within one source type or one source (thread / query), and
+# one author's tweets.
+
+_INDEXES = {
+    # leads with the time, so it serves plain window scans too; the other
+    # columns cover window_stats, so counting a window never reads rows
+    "idx_tweets_window_stats": "tweets (created_ms, source_type, source_detail, bucket)",
+    "idx_tweets_source_type_time": "tweets (source_type, created_ms)",
+    "idx_tweets_source_detail_time": "tweets (source_detail, created_ms)",
+    "idx_tweets_author": "tweets (author_handle)",
+}
+
+# indexes made redundant by the ones above; every insert maintains each
+# index, so older databases drop them
+_DROPPED_INDEXES = ("idx_tweets_created_ms",)
+
+# (query, params, index it must use); see check_query_plans
+_PLAN_CHECKS = [
+    (
+        "SELECT * FROM tweets WHERE created_ms >= ? AND created_ms <= ? ORDER BY created_ms DESC",
+        (0, 1), "idx_tweets_window_stats",
+    ),
+    (
+        "SELECT * FROM tweets WHERE source_type = ? AND created_ms >= ? ORDER BY created_ms DESC",
+        ("reply", 0), "idx_tweets_source_type_time",
+    ),
+    (
+        "SELECT * FROM tweets WHERE source_detail = ? AND created_ms >= ? ORDER BY created_ms DESC",
+        ("x", 0), "idx_tweets_source_detail_time",
+    ),
+    (
+        # a query_page page past the first
+        "SELECT tweet_id FROM tweets WHERE created_ms >= ? AND source_type = ? "
+        "AND created_ms <= ? AND (created_ms, tweet_id) < (?, ?) "
+        "ORDER BY created_ms DESC, tweet_id DESC LIMIT 51",
+        (0, "reply", 1, 1, "x"), "idx_tweets_source_type_time",
+    ),
+    (
+        "SELECT source_type, source_detail, bucket, COUNT(*) FROM tweets "
+        "WHERE created_ms >= ? AND created_ms <= ? GROUP BY source_type, source_detail, bucket",
+        (0, 1), "idx_tweets_window_stats",
+    ),
+    (
+        "SELECT * FROM tweets WHERE author_handle = ?",
+        ("x",), "idx_tweets_author",
+    ),
+]
+
+
+def _ensure_indexes(conn):
+    existing = {
+        r["name"] for r in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'tweets'"
+        )
+    }
+    for name, on in _INDEXES.items():
+        if name not in existing:
+            conn.execute(f"CREATE INDEX {name} ON {on}")
+    for name in _DROPPED_INDEXES:
+        if name in existing:
+            conn.execute(f"DROP INDEX {name}")
+
+
+def check_query_plans() -> list[str]:
+    """Return a problem for each access path whose ``EXPLAIN QUERY PLAN``
+    does not use its index or sorts the whole result in a temp B-tree
+    (empty if all is well). Sorting only ties on the time column ("RIGHT
+    PART OF ORDER BY") streams, and is fine."""
+    problems = []
+    # a fresh connection: pooled ones keep statements (and their plans)
+    # prepared against the schema as it was
+    conn = sqlite3.connect(DB_PATH)
+    for sql, params, index in _PLAN_CHECKS:
+        plan = " / ".join(r[3] for r in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+        if f"USING INDEX {index}" not in plan and f"USING COVERING INDEX {index}" not in plan:
+            problems.append(f"{sql}\n  expected {index}, got: {plan}")
+        elif "TEMP B-TREE FOR ORDER BY" in plan:
+            problems.append(f"{sql}\n  sorts in a temp B-tree: {plan}")
     conn.close()
+    return problems
+
+
+def _backfill_created_ms(conn):
+    rows = conn.execute(
+        "SELECT tweet_id, tweet_created_at FROM tweets WHERE created_ms IS NULL"
+    ).fetchall()
+    conn.executemany(
+        "UPDATE tweets SET created_ms = ? WHERE tweet_id = ?",
+        [(created_ms(r["tweet_created_at"], r["tweet_id"], "db"), r["tweet_id"]) for r in rows],
+    )
 
 
 def tweet_exists(tweet_id: str) -> bool:
-    conn = _connect()
-    row = conn.execute(
-        "SELECT 1 FROM tweets WHERE tweet_id = ?", (tweet_id,)
-    ).fetchone()
-    conn.close()
+    with _reading() as conn:
+        row = conn.execute(
+            "SELECT 1 FROM tweets WHERE tweet_id = ?", (tweet_id,)
+        ).fetchone()
     return row is not None
 
 
+_TWEET_COLUMNS = (
+    "tweet_id", "author_name", "author_handle", "text", "tweet_url",
+    "source_type", "source_detail", "parent_text", "parent_url",
+    "likes", "retweets", "replies",
+    "tweet_created_at", "created_ms", "collected_at",
+    "bucket", "bucket_scores", "classifier_version",
+)
+
+# rows per INSERT statement: 18 columns x 1000 rows stays well under
+# SQLite's 32766 bound-parameter limit
+_INSERT_CHUNK = 1000
+
+
+def _insert_sql(n: int) -> str:
+    row = f"({', '.join('?' * len(_TWEET_COLUMNS))})"
+    return (
+        f"INSERT INTO tweets ({', '.join(_TWEET_COLUMNS)}) VALUES {', '.join([row] * n)} "
+        "ON CONFLICT (tweet_id) DO NOTHING RETURNING tweet_id"
+    )
+
+
+def _insert_params(data: dict) -> tuple:
+    # rows that were not classified are stored unclassified, for
+    # reclassify_stale to pick up
+    scores = data.get("bucket_scores")
+    row = {
+        **data,
+        "created_ms": created_ms(data.get("tweet_created_at", ""), data["tweet_id"], "db"),
+        "bucket": data.get("bucket"),
+        "bucket_scores": json.dumps(scores) if isinstance(scores, dict) else scores,
+        "classifier_version": data.get("classifier_version"),
+    }
+    return tuple(row[c] for c in _TWEET_COLUMNS)
+
+
 def insert_tweet(data: dict) -> bool:
     """Insert a tweet if it doesn't already exist. Returns True if inserted."""
-    if tweet_exists(data["tweet_id"]):
+    return bool(insert_tweets([data]))
+
+
+def insert_tweets(batch: list[dict]) -> list[str]:
+    """Insert a batch of tweets in one transaction, skipping any already
+    stored (or repeated within the batch). Returns the inserted IDs in
+    batch order.
+
+    Rows go in as multi-row ``INSERT ... ON CONFLICT DO NOTHING
+    RETURNING`` statements, so SQLite itself reports which were new.
+    """
+    if not batch:
+        return []
+    params = [_insert_params(data) for data in batch]
+    inserted: set[str] = set()
+    with _writing() as conn:
+        for i in range(0, len(params), _INSERT_CHUNK):
+            chunk = params[i:i + _INSERT_CHUNK]
+            rows = conn.execute(_insert_sql(len(chunk)), [v for p in chunk for v in p]).fetchall()
+            inserted.update(r[0] for r in rows)
+    return [tid for tid in dict.fromkeys(d["tweet_id"] for d in batch) if tid in inserted]
+
+
+# filters query_page accepts, and the column each tests
+_FILTERS = ("source_type", "source_detail", "author_handle", "bucket")
+
+
+def _window(since_ms: int | None, until_ms: int | None, filters: dict) -> tuple[list[str], list]:
+    clauses = []
+    params: list = []
+
+    if since_ms is not None:
+        clauses.append("created_ms >= ?")
+        params.append(since_ms)
+    if until_ms is not None:
+        clauses.append("created_ms <= ?")
+        params.append(until_ms)
+    for col, value in filters.items():
+        if col not in _FILTERS:
+            raise ValueError(f"cannot filter tweets on {col!r}")
+        if value is not None:
+            clauses.append(f"{col} = ?")
+            params.append(value)
+    return clauses, params
+
+
+def _where(clauses: list[str]) -> str:
+    return f" WHERE {' AND '.join(clauses)}" if clauses else ""
+
+
+def query_tweets(
+    since_ms: int | None = None,
+    until_ms: int | None = None,
+) -> list[dict]:
+    """Query tweets created in an optional [since, until] range of UTC
+    epoch milliseconds (see ``timeutil.to_ms``), newest first."""
+    clauses, params = _window(since_ms, until_ms, {})
+    with _reading() as conn:
+        rows = conn.execute(
+            f"SELECT * FROM tweets{_where(clauses)} ORDER BY created_ms DESC", params
+        ).fetchall()
+    return [dict(r) for r in rows]
+
+
+def query_page(
+    since_ms: int | None = None,
+    until_ms: int | None = None,
+    after: tuple[int, str] | None = None,
+    limit: int = 50,
+    columns: list[str] | None = None,
+    **filters,
+) -> tuple[list[dict], tuple[int, str] | None]:
+    """One page of tweets in a time window, newest first.
+
+    Pages are keyset-paginated on (created_ms, tweet_id): pass the
+    cursor returned with one page as ``after`` to get the next. Returns
+    (rows, cursor), the cursor being None on the last page.
+
+    ``columns`` limits what is read for each row (``created_ms`` and
+    ``tweet_id`` always come along, for the cursor); ``filters`` match
+    ``source_type``, ``source_detail``, ``author_handle`` or ``bucket``
+    exactly, None meaning no filter.
+    """
+    cols = list(dict.fromkeys(["tweet_id", "created_ms", *(columns or _TWEET_COLUMNS)]))
+    unknown = set(cols) - set(_TWEET_COLUMNS)
+    if unknown:
+        raise ValueError(f"unknown tweet columns: {sorted(unknown)}")
+    clauses, params = _window(since_ms, until_ms, filters)
+    if after is not None:
+        # the plain bound lets the index range-scan; the row value breaks
+        # ties between tweets created in the same millisecond
+        clauses += ["created_ms <= ?", "(created_ms, tweet_id) < (?, ?)"]
+        params += [after[0], *after]
+    with _reading() as conn:
+        rows = conn.execute(
+            f"SELECT {', '.join(cols)} FROM tweets{_where(clauses)} "
+            "ORDER BY created_ms DESC, tweet_id DESC LIMIT ?",
+            [*params, limit + 1],
+        ).fetchall()
+    page = [dict(r) for r in rows[:limit]]
+    cursor = (page[-1]["created_ms"], page[-1]["tweet_id"]) if len(rows) > limit else None
+    return page, cursor
+
+
+def window_stats(since_ms: int | None = None, until_ms: int | None = None) -> dict:
+    """Tweet counts for a time window, from one GROUP BY over an index.
+
+    Returns ``total`` plus counts keyed by ``source_type``, by ``thread``
+    (the ``source_detail`` of timeline and thread replies, i.e.
+    ``@handle/tweet_id``), by search ``query`` (that of keyword
+    mentions) and by ``bucket`` (None for rows not yet classified).
+    """
+    clauses, params = _window(since_ms, until_ms, {})
+    with _reading() as conn:
+        groups = conn.execute(
+            f"SELECT source_type, source_detail, bucket, COUNT(*) AS n FROM tweets{_where(clauses)} "
+            "GROUP BY source_type, source_detail, bucket",
+            params,
+        ).fetchall()
+    stats: dict = {"total": 0, "source_type": {}, "thread": {}, "query": {}, "bucket": {}}
+    for g in groups:
+        n = g["n"]
+        stats["total"] += n
+        stats["source_type"][g["source_type"]] = stats["source_type"].get(g["source_type"], 0) + n
+        stats["bucket"][g["bucket"]] = stats["bucket"].get(g["bucket"], 0) + n
+        by = "query" if g["source_type"] == "keyword_mention" else "thread"
+        stats[by][g["source_detail"]] = stats[by].get(g["source_detail"], 0) + n
+    return stats
+
+
+def get_stale_classifications(version: int, after_rowid: int = 0, limit: int = 500) -> list[dict]:
+    """Return up to ``limit`` rows classified by an older classifier than
+    ``version`` (or never), in rowid order after ``after_rowid``."""
+    with _reading() as conn:
+        rows = conn.execute(
+            """
+            SELECT rowid, tweet_id, text FROM tweets
+            WHERE rowid > ? AND (classifier_version IS NULL OR classifier_version < ?)
+            ORDER BY rowid LIMIT ?
+            """,
+            (after_rowid, version, limit),
+        ).fetchall()
+    return [dict(r) for r in rows]
+
+
+def update_classifications(results: list[dict], version: int):
+    """Store ``{tweet_id, bucket, bucket_scores}`` results in one transaction."""
+    with _writing() as conn:
+        conn.executemany(
+            """
+            UPDATE tweets SET bucket = ?, bucket_scores = ?, classifier_version = ?
+            WHERE tweet_id = ?
+            """,
+            [
+                (r["bucket"], json.dumps(r["bucket_scores"]), version, r["tweet_id"])
+                for r in results
+            ],
+        )
+
+
+def get_reply_ids(source_detail: str) -> set[str]:
+    """IDs of the stored replies to one parent (``@handle/tweet_id``)."""
+    with _reading() as conn:
+        rows = conn.execute(
+            "SELECT tweet_id FROM tweets WHERE source_detail = ?", (source_detail,)
+        ).fetchall()
+    return {r["tweet_id"] for r in rows}
+
+
+def get_thread_states(tweet_ids: list[str]) -> dict[str, dict]:
+    """Return the stored high-water mark for each parent tweet we have scraped."""
+    if not tweet_ids:
+        return {}
+    placeholders = ",".join("?" * len(tweet_ids))
+    with _reading() as conn:
+        rows = conn.execute(
+            f"SELECT * FROM thread_state WHERE tweet_id IN ({placeholders})", tweet_ids
+        ).fetchall()
+    return {r["tweet_id"]: dict(r) for r in rows}
+
+
+def update_thread_state(tweet_id: str, reply_count: int | None, newest_reply_id: str | None):
+    """Record a finished scrape of a parent tweet's replies."""
+    with _writing() as conn:
+        conn.execute(
+            """
+            INSERT INTO thread_state (tweet_id, reply_count, newest_reply_id, last_scraped_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(tweet_id) DO UPDATE SET
+                reply_count = excluded.reply_count,
+                newest_reply_id = excluded.newest_reply_id,
+                last_scraped_at = excluded.last_scraped_at
+            """,
+            (tweet_id, reply_count, newest_reply_id, datetime.now(timezone.utc).isoformat()),
+        )
+
+
+def get_target_yields(target_keys: list[str]) -> dict[str, float]:
+    """Return the smoothed new-rows-per-scroll for each known target."""
+    if not target_keys:
+        return {}
+    placeholders = ",".join("?" * len(target_keys))
+    with _reading() as conn:
+        rows = conn.execute(
+            f"SELECT target_key, yield_per_scroll FROM target_yield WHERE target_key IN ({placeholders})",
+            target_keys,
+        ).fetchall()
+    return {r["target_key"]: r["yield_per_scroll"] for r in rows}
+
+
+def get_target_history(target_keys: list[str]) -> dict[str, dict]:
+    """Return the full ``target_yield`` row for each known target."""
+    if not target_keys:
+        return {}
+    placeholders = ",".join("?" * len(target_keys))
+    with _reading() as conn:
+        rows = conn.execute(
+            f"SELECT * FROM target_yield WHERE target_key IN ({placeholders})",
+            target_keys,
+        ).fetchall()
+    return {r["target_key"]: dict(r) for r in rows}
+
+
+def record_target_yield(target_key: str, new_rows: int, scrolls: int, alpha: float = 0.5):
+    """Fold one run's result into the target's moving-average yield.
+
+    The initial page load counts as a scroll, so a target read in a single
+    pass is not divided by zero.
+    """
+    y = new_rows / (scrolls + 1)
+    with _writing() as conn:
+        conn.execute(
+            """
+            INSERT INTO target_yield (target_key, runs, yield_per_scroll, last_new_rows, last_run_at)
+            VALUES (?, 1, ?, ?, ?)
+            ON CONFLICT(target_key) DO UPDATE SET
+                runs = runs + 1,
+                yield_per_scroll = ? * excluded.yield_per_scroll + (1 - ?) * yield_per_scroll,
+                last_new_rows = excluded.last_new_rows,
+                last_run_at = excluded.last_run_at
+            """,
+            (target_key, y, new_rows, datetime.now(timezone.utc).isoformat(), alpha, alpha),
+        )
+
+
+# ── run journal ──────────────────────────────────────────────────────
+
+_JOURNAL_KEEP_RUNS = 20
+
+
+def start_run(since_iso: str, targets: list[dict], pid: int) -> int:
+    """Journal a new run and its planned targets; returns the run ID.
+
+    Each target gets a ``position`` key, its row in the journal.
+    """
+    now = datetime.now(timezone.utc).isoformat()
+    with _writing() as conn:
+        run_id = conn.execute(
+            "INSERT INTO runs (since, status, pid, started_at) VALUES (?, 'running', ?, ?)",
+            (since_iso, pid, now),
+        ).lastrowid
+        for i, target in enumerate(targets):
+            target["position"] = i
+        conn.executemany(
+            "INSERT INTO run_targets (run_id, position, target, updated_at) VALUES (?, ?, ?, ?)",
+            [(run_id, t["position"], json.dumps(t), now) for t in targets],
+        )
+        # only recent runs can be resumed; keep the journal small
+        conn.execute(
+            "DELETE FROM run_targets WHERE run_id <= ?", (run_id - _JOURNAL_KEEP_RUNS,)
+        )
+    return run_id
+
+
+def reopen_run(run_id: int, pid: int):
+    """Mark an interrupted run as running again under a new process."""
+    with _writing() as conn:
+        conn.execute(
+            "UPDATE runs SET status = 'running', pid = ?, finished_at = NULL WHERE run_id = ?",
+            (pid, run_id),
+        )
+
+
+def finish_run_target(
+    run_id: int, position: int, status: str,
+    new_rows: int = 0,
+):
+    """Record how one journaled target ended: done, error, skipped or budget.
+
+    ``budget`` marks a target left out on purpose by the time budget; like
+    ``done`` it is not retried on resume.
+    """
+    with _writing() as conn:
+        conn.execute(
+            """
+            UPDATE run_targets SET status = ?, new_rows = ?, updated_at = ?
+            WHERE run_id = ? AND position = ?
+            """,
+            (status, new_rows, datetime.now(timezone.utc).isoformat(), run_id, position),
+        )
+
+
+def finish_run(run_id: int, status: str):
+    with _writing() as conn:
+        conn.execute(
+            "UPDATE runs SET status = ?, finished_at = ? WHERE run_id = ?",
+            (status, datetime.now(timezone.utc).isoformat(), run_id),
+        )
+
+
+def get_run_targets(run_id: int, incomplete_only: bool = False) -> list[dict]:
+    """Return a run's journaled targets in planned order."""
+    where = " AND status NOT IN ('done', 'budget')" if incomplete_only else ""
+    with _reading() as conn:
+        rows = conn.execute(
+            f"SELECT target FROM run_targets WHERE run_id = ?{where} ORDER BY position",
+            (run_id,),
+        ).fetchall()
+    return [json.loads(r["target"]) for r in rows]
+
+
+def get_last_run() -> dict | None:
+    """Return the most recent run with its target and settled counts.
+
+    ``done`` counts targets that finished or were skipped by the time budget.
+    """
+    with _reading() as conn:
+        row = conn.execute(
+            """
+            SELECT r.*,
+                   COUNT(t.position) AS targets,
+                   COALESCE(SUM(t.status IN ('done', 'budget')), 0) AS done
+            FROM runs r LEFT JOIN run_targets t ON t.run_id = r.run_id
+            GROUP BY r.run_id
+            ORDER BY r.run_id DESC
+            LIMIT 1
+            """
+        ).fetchone()
+    return dict(row) if row else None
+
+
+# ── benchmark ────────────────────────────────────────────────────────
+
+def _bench_rows(n: int, offset: int = 0) -> list[dict]:
+    return [
+        {
+            "tweet_id": str(1_900_000_000_000_000_000 + offset + i),
+            "author_name": "Bench User", "author_handle": f"user{i % 997}",
+            "text": "Indus keeps timing out when I upload a long PDF " * 3,
+            "tweet_url": f"https://x.com/user/status/{offset + i}",
+            "source_type": "reply", "source_detail": "bench",
+            "parent_text": "", "parent_url": "",
+            "likes": 0, "retweets": 0, "replies": 0,
+            "tweet_created_at": "2026-02-25T10:00:00.000Z",
+            "collected_at": "2026-02-25T11:00:00+00:00",
+        }
+        for i in range(n)
+    ]
+
+
+def _legacy_insert(data: dict) -> bool:
+    # the old per-row path: tweet_exists, then insert, each on a fresh
+    # connection, one commit per row
+    conn = sqlite3.connect(DB_PATH)
+    exists = conn.execute("SELECT 1 FROM tweets WHERE tweet_id = ?", (data["tweet_id"],)).fetchone()
+    conn.close()
+    if exists:
         return False
-    conn = _connect()
+    conn = sqlite3.connect(DB_PATH)
     conn.execute(
-        """
-        INSERT INTO tweets
-            (tweet_id, author_name, author_handle, text, tweet_url,
-             source_type, source_detail, parent_text, parent_url,
-             likes, retweets, replies,
-             tweet_created_at, collected_at)
-        VALUES
-            (:tweet_id, :author_name, :author_handle, :text, :tweet_url,
-             :source_type, :source_detail, :parent_text, :parent_url,
-             :likes, :retweets, :replies,
-             :tweet_created_at, :collected_at)
-        """,
-        data,
+        f"INSERT OR IGNORE INTO tweets ({', '.join(_TWEET_COLUMNS)}) "
+        f"VALUES ({', '.join('?' * len(_TWEET_COLUMNS))})",
+        _insert_params(data),
     )
     conn.commit()
     conn.close()
     return True
 
 
-def query_tweets(
-    since_iso: str | None = None,
-    until_iso: str | None = None,
-) -> list[dict]:
-    """Query tweets with optional date range filter."""
-    conn = _connect()
-    clauses = []
-    params: list = []
+def _bench(n: int):
+    global DB_PATH
+    legacy_n = min(n, 5000)
+    with tempfile.TemporaryDirectory() as tmp:
+        DB_PATH = os.path.join(tmp, "bench.db")
+        init_db()
+        batched = _bench_rows(n)
+        cases = [
+            (f"per row, {legacy_n:,} rows", legacy_n,
+             lambda: [_legacy_insert(r) for r in _bench_rows(legacy_n, offset=2 * n)]),
+            ("insert_tweets, batches of 200", n,
+             lambda: [insert_tweets(batched[i:i + 200]) for i in range(0, n, 200)]),
+            ("insert_tweets, all duplicates", n, lambda: insert_tweets(batched)),
+            ("insert_tweets, one batch", n, lambda: insert_tweets(_bench_rows(n, offset=n))),
+        ]
+        for label, rows, fn in cases:
+            started = time.perf_counter()
+            fn()
+            secs = time.perf_counter() - started
+            print(f"{label:>32}: {rows / secs:>10,.0f} rows/s  ({secs:.2f}s)")
+        close_connections()
 
-    if since_iso:
-        clauses.append("tweet_created_at >= ?")
-        params.append(since_iso)
-    if until_iso:
-        clauses.append("tweet_created_at <= ?")
-        params.append(until_iso)
 
-    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
-    rows = conn.execute(
-        f"SELECT * FROM tweets{where} ORDER BY tweet_created_at DESC", params
-    ).fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Feedback database")
+    parser.add_argument("--bench", type=int, nargs="?", const=100_000, metavar="N",
+                        help="Time inserting N tweets (default 100000)")
+    parser.add_argument("--check-plans", action="store_true",
+                        help="Check that dashboard queries use their indexes")
+    args = parser.parse_args()
+    if args.bench:
+        _bench(args.bench)
+    elif args.check_plans:
+        init_db()
+        problems = check_query_plans()
+        for p in problems:
+            print(p)
+        print(f"{len(_PLAN_CHECKS) - len(problems)}/{len(_PLAN_CHECKS)} query plans OK")
+        raise SystemExit(1 if problems else 0)
+    else:
+        parser.print_help()
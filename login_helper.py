@@ -4,17 +4,21 @@ Login Helper
 Opens a real Chrome browser so you can log in to X manually.
 Automatically detects when login succeeds and saves cookies.
 
-Run:  python login_helper.py
+Run:  python login_helper.py                          # saves data/cookies.json
+      python login_helper.py data/cookies_alt.json    # another account
 """
 
 import asyncio
 import json
 import os
+import sys
 
 from playwright.async_api import async_playwright
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 COOKIES_PATH = os.path.join(BASE_DIR, "data", "cookies.json")
+if len(sys.argv) > 1:
+    COOKIES_PATH = os.path.join(BASE_DIR, sys.argv[1])
 
 
 async def main():
@@ -0,0 +1,150 @@
+"""
+Multi-term matching
+~~~~~~~~~~~~~~~~~~~
+Search results are filtered against two term lists from the config:
+``exclude_terms`` (drop the tweet) and ``relevance_signals`` (keep it
+only if one appears). Rather than testing every term against every
+tweet, each list is compiled once into a single case-insensitive
+alternation regex that finds all of them in one pass over the text.
+
+The same patterns are exported in JavaScript syntax, so DOM extraction
+can drop rejected tweets inside the page before their text is sent
+back over CDP.
+"""
+
+import re
+
+# characters that need escaping in both Python and JS (unicode mode)
+# regexes; JS rejects escapes of anything else
+_SPECIAL = re.compile(r"[\\^$.*+?()[\]{}|/]")
+
+
+def _escape(term: str) -> str:
+    return _SPECIAL.sub(r"\\\g<0>", term)
+
+
+_END = ""  # trie key marking that a term ends at this node
+
+
+class TermMatcher:
+    """Finds any of a fixed set of terms in text with one compiled regex.
+
+    Matching ignores case (text is lowercased once, which is cheaper
+    than a case-insensitive regex) and, like the plain ``in`` checks it
+    replaces, by substring; with ``whole_words`` a term only matches
+    where it is not part of a longer word (``lag`` no longer matches
+    "flagship"). A term ending in ``*`` is a stem: ``hallucin*`` still
+    matches "hallucinates" when whole words are required.
+
+    The terms are compiled as a trie (``(?:ap(?:p|i))`` rather than
+    ``app|api``), so each position in the text costs one walk down the
+    trie instead of one attempt per term.
+    """
+
+    def __init__(self, terms: list[str], whole_words: bool = False):
+        self.terms = list(dict.fromkeys(t for t in terms if t.rstrip("*")))
+        self.whole_words = whole_words
+        # lowercased match text -> the term as configured
+        self._canonical = {t.rstrip("*").lower(): t for t in reversed(self.terms)}
+        self._stems = {t.rstrip("*").lower() for t in self.terms if t.endswith("*")}
+        # the regex reports the longest term at each position; the shorter
+        # ones there are its prefixes, and whether each of those ends on a
+        # word boundary depends only on the longer term's next character
+        self._prefixes = {
+            k: [
+                self._canonical[u] for u in sorted(self._canonical, key=len, reverse=True)
+                if k.startswith(u) and (
+                    not whole_words or u == k or u in self._stems or not self._is_word(k[len(u)])
+                )
+            ]
+            for k in self._canonical
+        }
+        if self._canonical:
+            pattern = self._source(r"\w")
+            self._pattern = re.compile(pattern)
+            # a lookahead matches at every position, so overlapping terms
+            # ("indus app" and "app") are all seen
+            self._scan = re.compile(f"(?=({pattern}))")
+        else:
+            self._pattern = self._scan = None
+
+    def __bool__(self) -> bool:
+        return self._pattern is not None
+
+    def _source(self, word: str) -> str:
+        trie: dict = {}
+        for key in self._canonical:
+            node = trie
+            for ch in key:
+                node = node.setdefault(ch, {})
+            node[_END] = key in self._stems
+
+        def build(node: dict) -> str:
+            # longer continuations first, so the longest term wins
+            alts = [_escape(ch) + build(child) for ch, child in node.items() if ch != _END]
+            if _END in node:
+                stem = node[_END]
+                alts.append("" if stem or not self.whole_words else f"(?!{word})")
+            if len(alts) == 1:
+                return alts[0]
+            return f"(?:{'|'.join(alts)})"
+
+        body = build(trie)
+        return f"(?<!{word}){body}" if self.whole_words else body
+
+    @staticmethod
+    def _is_word(ch: str) -> bool:
+        return ch.isalnum() or ch == "_"
+
+    def search(self, text: str) -> str | None:
+        """Return the first term found in ``text``, or None."""
+        if self._pattern is None:
+            return None
+        m = self._pattern.search(text.lower())
+        return self._canonical[m.group(0)] if m else None
+
+    def findall(self, text: str) -> list[str]:
+        """Return every distinct term found in ``text``, in order of appearance."""
+        if self._scan is None:
+            return []
+        found: dict[str, None] = {}
+        for hit in self._scan.findall(text.lower()):
+            found.update(dict.fromkeys(self._prefixes[hit]))
+        return list(found)
+
+    def js(self) -> dict | None:
+        """The same pattern as ``{source, flags}`` for a JavaScript RegExp."""
+        if self._pattern is None:
+            return None
+        return {"source": self._source(r"[\p{L}\p{N}_]"), "flags": "iu"}
+
+
+class RelevanceFilter:
+    """keep(text, handle) predicate for keyword search results.
+
+    A tweet is dropped if its text contains an exclude term, and kept
+    only if a relevance signal appears in its text or author handle.
+    """
+
+    def __init__(
+        self, exclude_terms: list[str], relevance_signals: list[str],
+        whole_words: bool = False,
+    ):
+        self.exclude = TermMatcher(exclude_terms, whole_words)
+        self.signals = TermMatcher(relevance_signals, whole_words)
+
+    def __call__(self, text: str, handle: str) -> bool:
+        if self.exclude.search(text):
+            return False
+        return self.signals.search(f"{text} {handle}") is not None
+
+    def explain(self, text: str, handle: str) -> dict:
+        """Which exclude terms and relevance signals a tweet matched."""
+        return {
+            "excluded": self.exclude.findall(text),
+            "signals": self.signals.findall(f"{text} {handle}"),
+        }
+
+    def js(self) -> dict:
+        """Argument for the in-page filter in ``_EXTRACT_ARTICLES_JS``."""
+        return {"exclude": self.exclude.js(), "signals": self.signals.js()}
@@ -0,0 +1,165 @@
+"""
+Search query planning
+~~~~~~~~~~~~~~~~~~~~~
+The configured ``search.queries`` overlap heavily: every tweet matching
+``"indus by sarvam"`` also matches ``"indus" "sarvam"``. Running each one
+as its own search re-reads the same tweets and throws the duplicates
+away at insert time. The planner instead
+
+  * drops queries whose recent unique yield is zero (they get retried
+    once their last run is older than ``retry_idle_days``),
+  * folds a query into a broader one that already covers it, and
+  * ORs what is left together into as few searches as fit X's query
+    length limit.
+
+Each result is attributed back to the most specific original query it
+matches, so ``source_detail`` still says which query found it.
+"""
+
+import re
+from datetime import datetime, timedelta, timezone
+
+# X rejects queries much past 500 characters; leave room for the
+# since:/until: operators appended to every search
+MAX_QUERY_LENGTH = 450
+
+# a query whose smoothed new-rows-per-scroll is below this is idle
+IDLE_YIELD = 0.01
+
+_TERM_RE = re.compile(r'"([^"]+)"|(\S+)')
+_WORD_RE = re.compile(r"[@#]?\w+")
+
+
+def parse_terms(query: str) -> list[str] | None:
+    """Split a plain query into its (implicitly ANDed) terms, lowercased.
+
+    Returns None for queries that use search operators (``OR``,
+    ``-term``, ``from:``, parentheses); those are run as written.
+    """
+    terms = []
+    for phrase, word in _TERM_RE.findall(query):
+        if word:
+            if word == "OR" or word.startswith("-") or ":" in word or any(c in word for c in "()"):
+                return None
+            terms.append(word.lower())
+        else:
+            terms.append(" ".join(phrase.lower().split()))
+    return terms or None
+
+
+def _words(term: str) -> list[str]:
+    return _WORD_RE.findall(term)
+
+
+def _implies(term: str, other: str) -> bool:
+    """True if every tweet containing ``other`` also contains ``term``."""
+    need, have = _words(term), _words(other)
+    return any(have[i:i + len(need)] == need for i in range(len(have) - len(need) + 1))
+
+
+def _covers(broad: list[str], narrow: list[str]) -> bool:
+    """True if the query ``broad`` matches every tweet ``narrow`` matches."""
+    return all(any(_implies(t, n) for n in narrow) for t in broad)
+
+
+def _term_pattern(term: str) -> re.Pattern:
+    words = [re.escape(w) for w in _words(term)]
+    return re.compile(r"(?<![\w@#])" + r"\W+".join(words) + r"(?!\w)", re.IGNORECASE)
+
+
+def attributor(queries: list[str]):
+    """Build attribute(text) -> the original query a result came from.
+
+    That is the matching query with the most words (the most specific
+    one), ties going to config order. Text that matches none of them
+    (X also matches on things like stemmed words) goes to the first.
+    """
+    parsed = []
+    for q in queries:
+        terms = parse_terms(q)
+        if terms is None:
+            continue
+        parsed.append((q, [_term_pattern(t) for t in terms], sum(len(_words(t)) for t in terms)))
+    parsed.sort(key=lambda p: -p[2])
+
+    def attribute(text: str) -> str:
+        for q, patterns, _ in parsed:
+            if all(p.search(text) for p in patterns):
+                return q
+        return queries[0]
+
+    return attribute
+
+
+def is_idle(history: dict | None, idle_runs: int, retry_after: timedelta) -> bool:
+    """True if a query's ``target_yield`` row says it has stopped finding
+    anything new and it was run recently enough not to need a retry."""
+    if not history or history["runs"] < idle_runs:
+        return False
+    if history["last_new_rows"] or history["yield_per_scroll"] >= IDLE_YIELD:
+        return False
+    try:
+        last_run = datetime.fromisoformat(history["last_run_at"])
+    except (TypeError, ValueError):
+        return False
+    return datetime.now(timezone.utc) - last_run < retry_after
+
+
+def plan_queries(
+    queries: list[str], history: dict[str, dict] | None = None,
+    max_length: int = MAX_QUERY_LENGTH, idle_runs: int = 3, retry_idle_days: float = 7,
+) -> tuple[list[dict], list[str]]:
+    """Plan the searches that cover ``queries``.
+
+    ``history`` maps ``"search:<query>"`` to its ``db.get_target_history``
+    row. Returns (groups, idle): each group is a dict with ``query`` (the
+    combined search to run), ``direct`` (the queries ORed into it) and
+    ``queries`` (every original query it covers, in config order, for
+    attribution); ``idle`` lists the queries skipped this run.
+    """
+    history = history or {}
+    retry_after = timedelta(days=retry_idle_days)
+    unique = list(dict.fromkeys(q.strip() for q in queries if q.strip()))
+    idle = [q for q in unique if is_idle(history.get(f"search:{q}"), idle_runs, retry_after)]
+    active = [q for q in unique if q not in idle]
+
+    terms = {q: parse_terms(q) for q in active}
+    covered_by: dict[str, str] = {}
+    for i, q in enumerate(active):
+        if terms[q] is None:
+            continue
+        for j, other in enumerate(active):
+            if i == j or terms[other] is None or other in covered_by:
+                continue
+            # equivalent queries: keep the first in config order
+            if _covers(terms[other], terms[q]) and (j < i or not _covers(terms[q], terms[other])):
+                covered_by[q] = other
+                break
+
+    def root(q: str) -> str:
+        while q in covered_by:
+            q = covered_by[q]
+        return q
+
+    direct = [q for q in active if q not in covered_by]
+    groups: list[dict] = []
+    for q in direct:
+        part = f"({q})"
+        # queries with their own operators are not safe to OR together
+        fits = [
+            g for g in groups
+            if terms[q] is not None and not g["opaque"]
+            and len(g["query"]) + len(" OR ") + len(part) <= max_length
+        ]
+        if fits:
+            fits[0]["query"] += f" OR {part}"
+            fits[0]["direct"].append(q)
+        else:
+            groups.append({"query": part, "direct": [q], "opaque": terms[q] is None})
+
+    for g in groups:
+        if len(g["direct"]) == 1:
+            g["query"] = g["direct"][0]
+        g["queries"] = [q for q in active if root(q) in g["direct"]]
+        del g["opaque"]
+    return groups, idle
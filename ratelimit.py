@@ -0,0 +1,131 @@
+"""
+Request pacing for X
+~~~~~~~~~~~~~~~~~~~~
+Every navigation, scroll and API call the collector makes goes through
+a RequestScheduler. Each (account, endpoint class) pair has a token
+bucket sized from X's published window (e.g. 150 TweetDetail calls per
+15 minutes), so a run goes as fast as the quota allows and no faster.
+``x-rate-limit-*`` response headers re-tune a bucket to what X says is
+left, and rate-limit errors back the endpoint off exponentially with
+jitter.
+"""
+
+import asyncio
+import logging
+import random
+import time
+
+log = logging.getLogger("collector")
+
+# endpoint class -> (requests, window seconds) per account
+DEFAULT_LIMITS = {
+    "timeline_api": (50, 900),
+    "tweet_detail": (150, 900),
+    "search": (50, 900),
+}
+
+
+class PastDeadline(Exception):
+    """Raised by ``acquire`` when the wait would run past its deadline."""
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self) -> float:
+        """Seconds until a token is available (0 if one is now)."""
+        self._refill()
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self):
+        self._refill()
+        self.tokens -= 1
+
+
+class RequestScheduler:
+    """Token buckets plus backoff state, keyed by (account, endpoint class)."""
+
+    def __init__(
+        self, limits: dict | None = None,
+        base_backoff: float = 15, max_backoff: float = 900,
+    ):
+        self.limits = {**DEFAULT_LIMITS, **{k: tuple(v) for k, v in (limits or {}).items()}}
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._buckets: dict[tuple[str, str], TokenBucket] = {}
+        self._locks: dict[tuple[str, str], asyncio.Lock] = {}
+        self._blocked_until: dict[tuple[str, str], float] = {}
+        self._strikes: dict[tuple[str, str], int] = {}
+        self.waited = 0.0
+
+    def _bucket(self, key: tuple[str, str]) -> TokenBucket:
+        if key not in self._buckets:
+            requests, window = self.limits.get(key[1], (60, 60))
+            self._buckets[key] = TokenBucket(requests / window, requests)
+        return self._buckets[key]
+
+    async def acquire(self, account: str, endpoint: str, deadline: float | None = None):
+        """Wait until ``account`` may make one more ``endpoint`` request.
+
+        Raises PastDeadline rather than wait beyond ``deadline`` (a
+        ``time.monotonic()`` value).
+        """
+        key = (account, endpoint)
+        bucket = self._bucket(key)
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            while True:
+                now = time.monotonic()
+                blocked = self._blocked_until.get(key, 0) - now
+                wait = max(blocked, bucket.wait_time())
+                if wait <= 0:
+                    bucket.take()
+                    return
+                if deadline is not None and now + wait > deadline:
+                    raise PastDeadline(f"{endpoint} for {account} is held {wait:.0f}s")
+                self.waited += wait
+                await asyncio.sleep(wait)
+
+    def observe(self, account: str, endpoint: str, headers: dict):
+        """Re-tune a bucket from X's ``x-rate-limit-*`` response headers."""
+        try:
+            remaining = int(headers["x-rate-limit-remaining"])
+            reset_in = int(headers["x-rate-limit-reset"]) - time.time()
+        except (KeyError, ValueError):
+            return
+        key = (account, endpoint)
+        if remaining <= 0 and reset_in > 0:
+            self._blocked_until[key] = time.monotonic() + reset_in
+            return
+        bucket = self._bucket(key)
+        bucket.tokens = min(bucket.tokens, remaining)
+        if reset_in > 0:
+            # spread what is left evenly over the rest of the window
+            bucket.rate = max(remaining / reset_in, 1 / self.max_backoff)
+        self._strikes.pop(key, None)
+
+    def backoff(self, account: str, endpoint: str, reset_at: float | None = None):
+        """Hold ``endpoint`` for ``account`` after a rate-limit signal.
+
+        Waits double with each consecutive strike (with +/-50% jitter) up to
+        ``max_backoff``, and never less than until ``reset_at`` (epoch
+        seconds) when X said when the window resets.
+        """
+        key = (account, endpoint)
+        strikes = self._strikes[key] = self._strikes.get(key, 0) + 1
+        wait = min(self.max_backoff, self.base_backoff * 2 ** (strikes - 1))
+        wait *= random.uniform(0.5, 1.5)
+        if reset_at:
+            wait = max(wait, reset_at - time.time())
+        self._blocked_until[key] = time.monotonic() + wait
+        log.warning("Rate limited on %s for %s, backing off %.0fs", endpoint, account, wait)
@@ -0,0 +1,158 @@
+"""
+Tweet timestamps
+~~~~~~~~~~~~~~~~
+Tweets reach us with their creation time in whatever form the source
+used: the DOM's ISO ``datetime`` attribute, X's GraphQL
+``Wed Feb 25 10:00:00 +0000 2026`` or twikit's string of it. Storage and
+time-window queries use one canonical form, epoch milliseconds (UTC).
+
+Each source sticks to one format, so the parser remembers which one
+last worked per ``source`` and tries it first; ISO strings go through
+``datetime.fromisoformat`` and X's format through a hand-rolled split
+rather than ``strptime``. A tweet ID alone is enough when the string is
+missing: its top bits are its creation time.
+
+Benchmark:  python timeutil.py --bench [N]
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+
+_TWITTER_EPOCH_MS = 1288834974657
+
+_MONTHS = {
+    m: i for i, m in enumerate(
+        ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"), 1,
+    )
+}
+
+
+def _iso(value: str) -> datetime:
+    # fromisoformat only takes a trailing "Z" from Python 3.11 on
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value)
+
+
+def _x_date(value: str) -> datetime:
+    # "Wed Feb 25 10:00:00 +0000 2026"
+    try:
+        _, mon, day, hms, offset, year = value.split()
+        h, m, s = hms.split(":")
+        sign = -1 if offset[0] == "-" else 1
+        tz = timezone(sign * timedelta(hours=int(offset[1:3]), minutes=int(offset[3:5])))
+        return datetime(int(year), _MONTHS[mon], int(day), int(h), int(m), int(s), tzinfo=tz)
+    except (KeyError, IndexError):
+        raise ValueError(f"not an X date: {value!r}") from None
+
+
+# fromisoformat also covers "2026-02-25" and "2026-02-25 10:00:00"
+_PARSERS = {
+    "iso": _iso,
+    "x": _x_date,
+}
+
+# source -> the parser name that last worked for it
+_memo: dict[str, str] = {}
+
+
+def parse_timestamp(value: str, source: str = "") -> datetime | None:
+    """Parse a tweet timestamp string; naive values are taken as UTC.
+
+    ``source`` (e.g. "dom", "twikit") keys the remembered format.
+    """
+    if not value:
+        return None
+    name = _memo.get(source)
+    if name is not None:
+        try:
+            dt = _PARSERS[name](value)
+            return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+        except ValueError:
+            pass
+    for name, parse in _PARSERS.items():
+        try:
+            dt = parse(value)
+        except ValueError:
+            continue
+        _memo[source] = name
+        return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+    return None
+
+
+def snowflake_ms(tweet_id: str) -> int | None:
+    """Creation time encoded in a tweet ID (top bits are ms since 2010-11-04)."""
+    try:
+        return (int(tweet_id) >> 22) + _TWITTER_EPOCH_MS
+    except (TypeError, ValueError):
+        return None
+
+
+def snowflake_time(tweet_id: str) -> datetime:
+    return datetime.fromtimestamp(snowflake_ms(tweet_id) / 1000, tz=timezone.utc)
+
+
+def to_ms(dt: datetime) -> int:
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp() * 1000)
+
+
+def created_ms(created_at: str, tweet_id: str | None = None, source: str = "") -> int | None:
+    """Epoch ms for a tweet, from its timestamp string or else its ID."""
+    dt = parse_timestamp(created_at, source)
+    if dt is not None:
+        return to_ms(dt)
+    return snowflake_ms(tweet_id) if tweet_id else None
+
+
+# ── benchmark ────────────────────────────────────────────────────────
+
+def _strptime_cascade(created_at: str) -> datetime | None:
+    # what collector.tweet_is_after used to do for every tweet
+    for fmt in (
+        "%a %b %d %H:%M:%S %z %Y",
+        "%Y-%m-%dT%H:%M:%S%z",
+        "%Y-%m-%dT%H:%M:%S.%f%z",
+        "%Y-%m-%d %H:%M:%S",
+        "%Y-%m-%d",
+    ):
+        try:
+            return datetime.strptime(created_at, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def _bench(n: int):
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    samples = {
+        "dom (ISO)": [
+            (start + timedelta(seconds=97 * i)).strftime("%Y-%m-%dT%H:%M:%S.000Z") for i in range(n)
+        ],
+        "twikit (X date)": [
+            (start + timedelta(seconds=97 * i)).strftime("%a %b %d %H:%M:%S +0000 %Y") for i in range(n)
+        ],
+    }
+    for label, values in samples.items():
+        for name, fn in (
+            ("strptime cascade", _strptime_cascade),
+            ("memoized", lambda v: parse_timestamp(v, label)),
+        ):
+            started = time.perf_counter()
+            for v in values:
+                fn(v)
+            secs = time.perf_counter() - started
+            print(f"{label:>16} {name:>17}: {n / secs:>12,.0f}/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tweet timestamp parsing")
+    parser.add_argument("--bench", type=int, nargs="?", const=100_000, metavar="N",
+                        help="Time parsing N timestamps per format (default 100000)")
+    args = parser.parse_args()
+    if args.bench:
+        _bench(args.bench)
+    else:
+        parser.print_help()
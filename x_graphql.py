@@ -0,0 +1,130 @@
+"""
+X GraphQL payload parsing
+~~~~~~~~~~~~~~~~~~~~~~~~~
+The x.com web client loads threads and search results through GraphQL
+endpoints (TweetDetail, SearchTimeline). Parsing those JSON payloads
+gives us every tweet on a page without touching the DOM, including the
+real like / retweet / reply counts.
+"""
+
+from datetime import timezone
+
+from timeutil import parse_timestamp
+
+# GraphQL operation names we listen for, matched against the response URL
+TWEET_DETAIL = "TweetDetail"
+SEARCH_TIMELINE = "SearchTimeline"
+
+
+def is_graphql_url(url: str, operations: tuple[str, ...]) -> bool:
+    if "/graphql/" not in url:
+        return False
+    return any(f"/{op}" in url for op in operations)
+
+
+def to_iso(created_at: str) -> str:
+    """Convert X's ``Wed Feb 25 10:00:00 +0000 2026`` to the DOM's ISO form."""
+    dt = parse_timestamp(created_at, "x")
+    if dt is None:
+        return created_at or ""
+    return dt.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+def _unwrap(result: dict) -> dict:
+    # tweets with visibility notices are nested one level deeper
+    if result.get("__typename") == "TweetWithVisibilityResults":
+        return result.get("tweet") or {}
+    return result
+
+
+def _user_fields(tweet: dict) -> tuple[str, str]:
+    user = (
+        tweet.get("core", {})
+        .get("user_results", {})
+        .get("result", {})
+    )
+    user = _unwrap(user)
+    # newer payloads moved screen_name/name from legacy into core
+    core = user.get("core") or {}
+    legacy = user.get("legacy") or {}
+    handle = core.get("screen_name") or legacy.get("screen_name") or ""
+    name = core.get("name") or legacy.get("name") or handle
+    return handle, name
+
+
+def _parse_tweet(result: dict) -> dict | None:
+    tweet = _unwrap(result)
+    legacy = tweet.get("legacy")
+    tweet_id = tweet.get("rest_id")
+    if not legacy or not tweet_id:
+        return None
+
+    handle, name = _user_fields(tweet)
+    note = (
+        tweet.get("note_tweet", {})
+        .get("note_tweet_results", {})
+        .get("result", {})
+        .get("text")
+    )
+    return {
+        "id": str(tweet_id),
+        "handle": handle,
+        "name": name,
+        "text": note or legacy.get("full_text", ""),
+        "created_at": to_iso(legacy.get("created_at", "")),
+        "likes": legacy.get("favorite_count", 0) or 0,
+        "retweets": legacy.get("retweet_count", 0) or 0,
+        "replies": legacy.get("reply_count", 0) or 0,
+        "conversation_id": legacy.get("conversation_id_str") or "",
+    }
+
+
+def extract_tweets(payload) -> list[dict]:
+    """Walk a GraphQL response and return every tweet it contains.
+
+    The exact instruction/entry nesting differs between endpoints and
+    changes often, so rather than following fixed paths this looks for
+    any ``tweet_results.result`` object anywhere in the payload. Quoted
+    tweets are skipped; they are not replies to the page's subject.
+    """
+    found: list[dict] = []
+    seen: set[str] = set()
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(reversed(node))
+            continue
+        if not isinstance(node, dict):
+            continue
+        for key, value in node.items():
+            if key == "quoted_status_result":
+                continue
+            if key == "tweet_results" and isinstance(value, dict):
+                tweet = _parse_tweet(value.get("result") or {})
+                if tweet and tweet["id"] not in seen:
+                    seen.add(tweet["id"])
+                    found.append(tweet)
+                continue
+            if isinstance(value, (dict, list)):
+                stack.append(value)
+    return found
+
+
+def conversation_replies(
+    tweets: list[dict], focal_id: str, conversation_id: str | None = None,
+) -> list[dict]:
+    """Keep the tweets of a TweetDetail payload that reply to ``focal_id``.
+
+    The payload also carries the focal tweet's ancestors and "Discover
+    more" / related-tweet modules. Replies share the focal tweet's
+    ``conversation_id`` (pass it once known; it is the focal ID itself
+    when the focal tweet starts the conversation) and, unlike its
+    ancestors, were posted after it, so have larger IDs.
+    """
+    conversation = conversation_id or focal_id
+    focal = int(focal_id)
+    return [
+        t for t in tweets
+        if t["conversation_id"] == conversation and int(t["id"]) > focal
+    ]